@@ -1,89 +1,162 @@
 # backend/auth/auth.py
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
-from backend.db.connection import create_connection
+import mysql.connector
+from backend.db.connection import get_connection
+from backend.cache.day_cache import get_day_cache
 
+# bcrypt work factor for new hashes; older hashes are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt releases the GIL, so hashing threads run in parallel
+AUTH_WORKERS = int(os.getenv("AUTH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_LOGIN_SQL = "SELECT * FROM users WHERE username = %s"
+
+# ----------------- Hashing -----------------
+def hash_password(password, rounds=None):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds or BCRYPT_ROUNDS))
+
+def check_password(password, password_hash):
+    if isinstance(password_hash, str):
+        password_hash = password_hash.encode('utf-8')
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash)
+
+def hash_rounds(password_hash):
+    """Work factor of a stored hash ($2b$12$... -> 12)"""
+    if isinstance(password_hash, bytes):
+        password_hash = password_hash.decode('utf-8')
+    return int(password_hash.split('$')[2])
+
+def needs_rehash(password_hash, rounds=None):
+    return hash_rounds(password_hash) < (rounds or BCRYPT_ROUNDS)
+
+# ----------------- Worker pool -----------------
+_auth_executor = None
+_auth_executor_lock = threading.Lock()
+
+def get_auth_executor():
+    """Pool that runs hashing (and the auth queries) off the caller's thread"""
+    global _auth_executor
+    if _auth_executor is None:
+        with _auth_executor_lock:
+            if _auth_executor is None:
+                _auth_executor = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="auth")
+    return _auth_executor
+
+def register_user_async(username, password, height_cm=None, weight_kg=None, gender=None):
+    """register_user on the auth pool; returns a Future of its result"""
+    return get_auth_executor().submit(register_user, username, password, height_cm, weight_kg, gender)
+
+def login_user_async(username, password):
+    """login_user on the auth pool; returns a Future of the user dict (or None)"""
+    return get_auth_executor().submit(login_user, username, password)
+
+# ----------------- Users -----------------
 def register_user(username, password, height_cm=None, weight_kg=None, gender=None):
     """Register a new user with hashed password"""
-    conn = create_connection()
-    if not conn:
-        return False
-    
-    cursor = conn.cursor()
-    
-    # Hash the password
-    hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-    
-    try:
-        cursor.execute(
-            "INSERT INTO users (username, password_hash, height_cm, weight_kg, gender) "
-            "VALUES (%s, %s, %s, %s, %s)",
-            (username, hashed, height_cm, weight_kg, gender)
-        )
-        conn.commit()
-        print(f"User '{username}' registered successfully.")
-        return True
-    except mysql.connector.Error as err:
-        print(f"Error: {err}")
-        return False
-    finally:
-        cursor.close()
-        conn.close()
+    # Hash the password before borrowing a pooled connection
+    hashed = hash_password(password)
+
+    with get_connection() as conn:
+        if not conn:
+            return False
+        
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "INSERT INTO users (username, password_hash, height_cm, weight_kg, gender) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                (username, hashed, height_cm, weight_kg, gender)
+            )
+            conn.commit()
+            print(f"User '{username}' registered successfully.")
+            return True
+        except mysql.connector.Error as err:
+            print(f"Error: {err}")
+            return False
+        finally:
+            cursor.close()
 
 def login_user(username, password):
     """Verify user credentials"""
-    conn = create_connection()
-    if not conn:
-        return False
-    
-    cursor = conn.cursor(dictionary=True)
-    try:
-        cursor.execute(
-            "SELECT * FROM users WHERE username = %s",
-            (username,)
-        )
-        user = cursor.fetchone()
-        if user and bcrypt.checkpw(password.encode('utf-8'), user['password_hash'].encode('utf-8')):
-            print(f"User '{username}' logged in successfully.")
-            return user  # return full user info
-        else:
-            print("Invalid username or password.")
-            return None
-    finally:
-        cursor.close()
-        conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return False
+        
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(_LOGIN_SQL, (username,))
+            user = cursor.fetchone()
+        finally:
+            cursor.close()
+
+    if user and check_password(password, user['password_hash']):
+        print(f"User '{username}' logged in successfully.")
+        if needs_rehash(user['password_hash']):
+            # Upgrade to the current work factor without delaying this login
+            get_auth_executor().submit(rehash_password, user['user_id'], password, user['password_hash'])
+        return user  # return full user info
+    else:
+        print("Invalid username or password.")
+        return None
+
+def rehash_password(user_id, password, old_hash):
+    """Store a hash at BCRYPT_ROUNDS, unless the password changed meanwhile"""
+    new_hash = hash_password(password)
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                "UPDATE users SET password_hash = %s WHERE user_id = %s AND password_hash = %s",
+                (new_hash, user_id, old_hash)
+            )
+            conn.commit()
+            return cursor.rowcount == 1
+        except mysql.connector.Error as err:
+            print(f"Error upgrading password hash: {err}")
+            return False
+        finally:
+            cursor.close()
 
 def get_user_by_id(user_id):
     """Fetch user info by user_id"""
-    conn = create_connection()
-    if not conn:
-        return None
+    with get_connection() as conn:
+        if not conn:
+            return None
 
-    cursor = conn.cursor(dictionary=True)
-    try:
-        cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
-        return cursor.fetchone()
-    finally:
-        cursor.close()
-        conn.close()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
 
 def update_user(user_id, height_cm=None, weight_kg=None, password=None):
     """Update user info"""
-    conn = create_connection()
-    if not conn:
-        return False
-
-    cursor = conn.cursor()
-    try:
-        if password:
-            hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            cursor.execute("UPDATE users SET password_hash=%s WHERE user_id=%s", (hashed, user_id))
-        if height_cm is not None:
-            cursor.execute("UPDATE users SET height_cm=%s WHERE user_id=%s", (height_cm, user_id))
-        if weight_kg is not None:
-            cursor.execute("UPDATE users SET weight_kg=%s WHERE user_id=%s", (weight_kg, user_id))
-        conn.commit()
-        return True
-    finally:
-        cursor.close()
-        conn.close()
+    hashed = hash_password(password) if password else None
+
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            if hashed:
+                cursor.execute("UPDATE users SET password_hash=%s WHERE user_id=%s", (hashed, user_id))
+            if height_cm is not None:
+                cursor.execute("UPDATE users SET height_cm=%s WHERE user_id=%s", (height_cm, user_id))
+            if weight_kg is not None:
+                cursor.execute("UPDATE users SET weight_kg=%s WHERE user_id=%s", (weight_kg, user_id))
+            conn.commit()
+        finally:
+            cursor.close()
+
+    # Cached snapshots hold the profile (height feeds BMI and the calorie target)
+    get_day_cache().invalidate_user(user_id)
+    return True
@@ -0,0 +1,86 @@
+# backend/cache/day_cache.py
+import os
+import threading
+from backend.cache.memory_cache import LRUCache
+
+DAY_CACHE_MAX_ENTRIES = int(os.getenv("DAY_CACHE_MAX_ENTRIES", "64"))
+
+
+class DayCache:
+    """
+    Per-user cache of day data (dashboard snapshots), keyed by (user_id, date).
+
+    Writers invalidate one day (food logs) or every day of a user (weight
+    logs and profile changes, which every snapshot includes). A load that
+    overlaps an invalidation for the same user is returned but not cached,
+    so a slow read can't put stale data back. Neither is a None result
+    (database unreachable), so the day is re-read once it is back.
+    """
+
+    def __init__(self, max_entries=DAY_CACHE_MAX_ENTRIES):
+        self._entries = LRUCache(max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._generations = {}  # user_id -> bumped by invalidate_user
+        self._writes = {}       # user_id -> bumped by any invalidation
+
+    def get(self, user_id, day):
+        """Cached value or None"""
+        entry = self._entries.get((user_id, day))
+        if entry is None:
+            return None
+        generation, value = entry
+        with self._lock:
+            if generation != self._generations.get(user_id, 0):
+                return None
+        return value
+
+    def load(self, user_id, day, loader):
+        """Call loader() and cache its result unless it is None or a write raced with it"""
+        with self._lock:
+            generation = self._generations.get(user_id, 0)
+            writes = self._writes.get(user_id, 0)
+
+        value = loader()
+
+        with self._lock:
+            if value is not None and self._writes.get(user_id, 0) == writes:
+                self._entries.put((user_id, day), (generation, value))
+        return value
+
+    def get_or_load(self, user_id, day, loader):
+        value = self.get(user_id, day)
+        if value is None:
+            value = self.load(user_id, day, loader)
+        return value
+
+    def __contains__(self, key):
+        return self.get(*key) is not None
+
+    # ----------------- Invalidation -----------------
+    def invalidate_day(self, user_id, day):
+        with self._lock:
+            self._writes[user_id] = self._writes.get(user_id, 0) + 1
+            self._entries.invalidate((user_id, day))
+
+    def invalidate_user(self, user_id):
+        # Old entries become unreachable and age out of the LRU
+        with self._lock:
+            self._writes[user_id] = self._writes.get(user_id, 0) + 1
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+    def stats(self):
+        return self._entries.stats()
+
+
+# ----------------- Shared cache -----------------
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_day_cache():
+    """Return the process-wide day cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DayCache()
+    return _cache
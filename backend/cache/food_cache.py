@@ -0,0 +1,170 @@
+# backend/cache/food_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from backend.cache.memory_cache import normalize_query
+
+CACHE_PATH = os.getenv("FOOD_CACHE_PATH", "data/food_cache.sqlite3")
+LEGACY_JSON_PATH = "data/cached_foods.json"
+MAX_ENTRIES = int(os.getenv("FOOD_CACHE_MAX_ENTRIES", "5000"))
+
+
+class FoodCache:
+    """
+    On-disk cache of USDA search results keyed by query.
+
+    Backed by SQLite (WAL mode) so writes are atomic, appends are incremental
+    and several processes can share the file. The set of cached keys and their
+    last-use times are kept in memory, so a miss never touches disk and a hit
+    is a single primary-key read. Least recently used entries are evicted once
+    the cache grows past max_entries.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_ENTRIES, legacy_json_path=LEGACY_JSON_PATH):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._touched = set()  # keys whose last_used changed since the last write
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                query TEXT PRIMARY KEY,
+                foods TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache_meta (key TEXT PRIMARY KEY, value TEXT)")
+
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+
+        # In-memory index: query -> last_used, least recently used first
+        self._index = OrderedDict(self._db.execute("SELECT query, last_used FROM search_cache ORDER BY last_used"))
+
+    # ----------------- Public API -----------------
+    def get(self, query):
+        """Return the cached food list for query, or None"""
+        with self._lock:
+            if query not in self._index:
+                return None
+            row = self._db.execute("SELECT foods FROM search_cache WHERE query = ?", (query,)).fetchone()
+            if row is None:
+                # Another process evicted it
+                del self._index[query]
+                return None
+            self._index[query] = time.time()
+            self._index.move_to_end(query)
+            self._touched.add(query)
+            return json.loads(row[0])
+
+    def put(self, query, foods):
+        """Store (or replace) the results for query in one atomic write"""
+        now = time.time()
+        payload = json.dumps(foods, separators=(",", ":"))
+        with self._lock:
+            self._index[query] = now
+            self._index.move_to_end(query)
+            self._touched.discard(query)
+            with self._transaction():
+                self._db.execute(
+                    "INSERT OR REPLACE INTO search_cache (query, foods, created_at, last_used) VALUES (?, ?, ?, ?)",
+                    (query, payload, now, now)
+                )
+                self._flush_touched()
+                self._evict()
+
+    def iter_foods(self):
+        """Yield every cached food (may repeat across queries)"""
+        with self._lock:
+            rows = self._db.execute("SELECT foods FROM search_cache").fetchall()
+        for (payload,) in rows:
+            yield from json.loads(payload)
+
+    def __contains__(self, query):
+        return query in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        with self._lock:
+            if self._touched:
+                with self._transaction():
+                    self._flush_touched()
+            self._db.close()
+
+    # ----------------- Internals -----------------
+    def _transaction(self):
+        return _Transaction(self._db)
+
+    def _flush_touched(self):
+        if self._touched:
+            self._db.executemany(
+                "UPDATE search_cache SET last_used = ? WHERE query = ?",
+                [(self._index[q], q) for q in self._touched if q in self._index]
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        overflow = len(self._index) - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = [self._index.popitem(last=False)[0] for _ in range(overflow)]
+        self._db.executemany("DELETE FROM search_cache WHERE query = ?", [(q,) for q in oldest])
+
+    def _migrate_json(self, json_path):
+        """One-time import of the old cached_foods.json"""
+        done = self._db.execute("SELECT value FROM cache_meta WHERE key = 'json_migrated'").fetchone()
+        if done:
+            return
+        try:
+            with open(json_path, "r") as f:
+                cached = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cached = {}
+
+        now = time.time()
+        with self._transaction():
+            self._db.executemany(
+                "INSERT OR IGNORE INTO search_cache (query, foods, created_at, last_used) VALUES (?, ?, ?, ?)",
+                [(normalize_query(q), json.dumps(foods, separators=(",", ":")), now, now) for q, foods in cached.items()]
+            )
+            self._db.execute("INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('json_migrated', ?)", (json_path,))
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK on an autocommit sqlite3 connection"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+# ----------------- Shared cache -----------------
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_food_cache():
+    """Return the process-wide food cache, opening it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FoodCache()
+    return _cache
@@ -0,0 +1,103 @@
+# backend/cache/food_index.py
+import threading
+from bisect import bisect_left
+from collections import Counter
+from backend.cache.memory_cache import normalize_query
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FoodIndex:
+    """
+    In-memory search index over locally known foods.
+
+    Word-prefix matches come from a sorted token list (every query word must
+    prefix some word of the food name); when that finds nothing, a trigram
+    index gives typo-tolerant matches. Foods are keyed by food_id, so adding
+    the same food twice is harmless. Safe to search while another thread adds.
+    """
+
+    def __init__(self):
+        self._foods = {}       # food_id -> food dict
+        self._names = {}       # food_id -> lowercased name
+        self._postings = {}    # token -> set(food_id)
+        self._trigram_postings = {}  # trigram -> set(food_id)
+        self._tokens = []      # sorted tokens, rebuilt lazily
+        self._tokens_dirty = False
+        self._lock = threading.Lock()
+
+    def add_many(self, foods):
+        with self._lock:
+            for food in foods:
+                self._add(food)
+
+    def add(self, food):
+        with self._lock:
+            self._add(food)
+
+    def __len__(self):
+        return len(self._foods)
+
+    def search(self, query, limit=10):
+        """Best local matches for query, most relevant first"""
+        text = normalize_query(query)
+        words = text.split()
+        if not words:
+            return []
+
+        with self._lock:
+            if self._tokens_dirty:
+                self._tokens = sorted(self._postings)
+                self._tokens_dirty = False
+
+            ids = None
+            for word in words:
+                matched = self._prefix_ids(word)
+                ids = matched if ids is None else ids & matched
+                if not ids:
+                    break
+
+            if ids:
+                ranked = sorted(ids, key=lambda i: (not self._names[i].startswith(text), len(self._names[i])))
+            else:
+                ranked = self._trigram_ids(text)
+            return [self._foods[i] for i in ranked[:limit]]
+
+    # ----------------- Internals (caller holds the lock) -----------------
+    def _add(self, food):
+        food_id = str(food["food_id"])
+        name = (food.get("name") or "").lower()
+        if food_id in self._foods:
+            self._foods[food_id] = food
+            return
+        self._foods[food_id] = food
+        self._names[food_id] = name
+
+        for token in set(name.replace(",", " ").split()):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._tokens_dirty = True
+            postings.add(food_id)
+
+        for gram in _trigrams(name):
+            self._trigram_postings.setdefault(gram, set()).add(food_id)
+
+    def _prefix_ids(self, prefix):
+        ids = set()
+        i = bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            ids |= self._postings[self._tokens[i]]
+            i += 1
+        return ids
+
+    def _trigram_ids(self, text):
+        grams = _trigrams(text)
+        scores = Counter()
+        for gram in grams:
+            scores.update(self._trigram_postings.get(gram, ()))
+        threshold = max(1, len(grams) // 2)
+        return [i for i, score in scores.most_common() if score >= threshold]
@@ -0,0 +1,125 @@
+# backend/cache/memory_cache.py
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Leading quantities like "2 tbsp", "1/2 cup of", "1.5 oz", "an". A bare number
+# is kept: it is often part of the name ("7 up", "5 spice")
+_UNITS = (
+    "tbsp|tbs|tablespoons?|tsp|teaspoons?|cups?|oz|ounces?|g|grams?|kg|lbs?|pounds?|"
+    "ml|l|liters?|litres?|slices?|pieces?|pcs?|servings?|scoops?|cans?|bowls?|glass(?:es)?"
+)
+_QUANTITY_PREFIX = re.compile(
+    rf"^(?:(?:\d+\s+\d+/\d+|\d+(?:[./]\d+)?)\s*(?:{_UNITS})\b\.?|an?(?:\s+(?:{_UNITS})\b\.?)?)\s+(?:of\s+)?",
+    re.IGNORECASE
+)
+
+
+def normalize_query(query):
+    """
+    Cache key for a food search: lowercased, whitespace collapsed and any
+    leading quantity with a unit ("2 tbsp sugar" -> "sugar") stripped.
+    Only the key is normalized; searches still send the user's text.
+    """
+    key = " ".join(query.lower().split())
+    stripped = _QUANTITY_PREFIX.sub("", key, count=1).strip()
+    return stripped or key
+
+
+def estimate_size(value):
+    """Rough deep size in bytes of JSON-like data (dicts, lists, scalars)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(v) for v in value)
+    return size
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU cache with per-entry TTL.
+
+    Evicts least recently used entries once either max_entries or max_bytes
+    (estimated footprint of the stored values) is exceeded.
+    """
+
+    def __init__(self, max_entries=512, max_bytes=None, ttl=None, sizeof=estimate_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+
+        self._data = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return default
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return default
+            self._data.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        size = self.sizeof(value) if self.max_bytes else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires_at, size)
+            self._bytes += size
+            self._shrink()
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._data)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    # ----------------- Internals (caller holds the lock) -----------------
+    def _remove(self, key):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _shrink(self):
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._data.popitem(last=False)
+            self._bytes -= size
+            self._counters["evictions"] += 1
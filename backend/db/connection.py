@@ -2,7 +2,11 @@
 import mysql.connector
 from mysql.connector import Error
 from dotenv import load_dotenv
+from contextlib import contextmanager
 import os
+import threading
+import time
+from backend.db.query_trace import trace_connection
 
 # Load environment variables from .env
 load_dotenv()
@@ -12,6 +16,16 @@ USER = os.getenv("MYSQL_USER")
 PASSWORD = os.getenv("MYSQL_PASSWORD")
 DATABASE = os.getenv("MYSQL_DB")
 
+# Storage backend: "mysql" (server from the settings above) or "sqlite"
+# (embedded file at SQLITE_PATH, see sqlite_backend.py)
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql")
+
+# Pool tuning (all optional in .env)
+POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "5"))
+POOL_TIMEOUT = float(os.getenv("MYSQL_POOL_TIMEOUT", "10"))          # seconds to wait for a free connection
+POOL_IDLE_SECONDS = float(os.getenv("MYSQL_POOL_IDLE_SECONDS", "300"))  # close connections idle longer than this
+POOL_CHECK_SECONDS = float(os.getenv("MYSQL_POOL_CHECK_SECONDS", "30"))  # ping connections idle longer than this
+
 def create_connection():
     """Create and return a MySQL database connection"""
     try:
@@ -22,8 +36,221 @@ def create_connection():
             database=DATABASE
         )
         if connection.is_connected():
-            print("Connected to MySQL database")
             return connection
     except Error as e:
         print(f"Error connecting to MySQL: {e}")
         return None
+
+
+class PoolTimeout(Error):
+    """Raised when no pooled connection became free within the timeout"""
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of MySQL connections.
+
+    Idle connections are reused LIFO, pinged before reuse once they have sat
+    for POOL_CHECK_SECONDS, and closed once idle for POOL_IDLE_SECONDS.
+    """
+
+    def __init__(self, factory=create_connection, max_size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 idle_seconds=POOL_IDLE_SECONDS, check_seconds=POOL_CHECK_SECONDS):
+        self.factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_seconds = idle_seconds
+        self.check_seconds = check_seconds
+
+        self._idle = []  # [(conn, released_at)], most recently used last
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._counters = {
+            "acquisitions": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "created": 0,
+            "reconnects": 0,
+            "evicted": 0,
+        }
+
+    # ----------------- Acquire / release -----------------
+    def acquire(self):
+        """Borrow a connection, opening one if the pool is below max_size"""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            self._counters["acquisitions"] += 1
+            waited = False
+            while True:
+                self._evict_idle()
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                    break
+                if self._in_use < self.max_size:
+                    conn, released_at = None, None
+                    break
+                if not waited:
+                    self._counters["waits"] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(msg=f"No connection available after {self.timeout}s")
+                self._cond.wait(remaining)
+            self._in_use += 1
+
+        # Network work happens outside the lock
+        try:
+            if conn is None:
+                conn = self._open()
+            elif time.monotonic() - released_at > self.check_seconds and not self._is_healthy(conn):
+                self._close(conn)
+                conn = self._open()
+                self._count("reconnects")
+        except BaseException:
+            self._free_slot()
+            raise
+
+        if conn is None:
+            self._free_slot()
+        return conn
+
+    def release(self, conn, discard=False):
+        """Return a connection to the pool (or close it if discard/broken)"""
+        if conn is None:
+            return
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except Error:
+                discard = True
+
+        if discard:
+            self._close(conn)
+            self._free_slot()
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager that borrows a connection and always gives it back"""
+        conn = self.acquire()
+        traced = trace_connection(conn)  # conn itself unless query tracing is on
+        broken = False
+        try:
+            yield traced
+        except (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError):
+            broken = True
+            raise
+        finally:
+            if traced is not conn:
+                traced.finish()
+            self.release(conn, discard=broken)
+
+    # ----------------- Maintenance -----------------
+    def close_all(self):
+        """Close every idle connection (borrowed ones close on release)"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._counters)
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._in_use
+            stats["max_size"] = self.max_size
+        return stats
+
+    # ----------------- Internals -----------------
+    def _open(self):
+        conn = self.factory()
+        if conn is not None:
+            self._count("created")
+        return conn
+
+    def _evict_idle(self):
+        # Caller holds self._cond; oldest connections sit at the front
+        cutoff = time.monotonic() - self.idle_seconds
+        while self._idle and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.pop(0)
+            self._counters["evicted"] += 1
+            self._close(conn)
+
+    def _free_slot(self):
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+    def _count(self, key):
+        with self._cond:
+            self._counters[key] += 1
+
+    @staticmethod
+    def _is_healthy(conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Error:
+            pass
+
+
+# ----------------- Backends -----------------
+def connection_factory(backend=None):
+    """The function that opens a connection for a storage backend (default DB_BACKEND)"""
+    backend = backend or DB_BACKEND
+    if backend == "mysql":
+        return create_connection
+    if backend == "sqlite":
+        from backend.db.sqlite_backend import create_sqlite_connection
+        return create_sqlite_connection
+    raise ValueError(f"Unknown DB_BACKEND {backend!r} (expected 'mysql' or 'sqlite')")
+
+
+# ----------------- Shared pool -----------------
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(factory=connection_factory())
+    return _pool
+
+def get_connection():
+    """
+    Borrow a pooled connection:
+
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            ...
+
+    Yields None if the database is unreachable, like create_connection().
+    Every caller checks for that: readers return an empty result, writers
+    return False.
+    """
+    return get_pool().connection()
+
+def pool_stats():
+    """Counters for sizing the pool: acquisitions, waits, reconnects, ..."""
+    return get_pool().stats()
+
+def close_pool():
+    if _pool is not None:
+        _pool.close_all()
@@ -0,0 +1,162 @@
+# backend/db/migrate.py
+"""
+Versioned schema migrations.
+
+    python -m backend.db.migrate             # apply pending migrations
+    python -m backend.db.migrate --status    # list applied / pending
+    python -m backend.db.migrate --check     # EXPLAIN the service queries (see query_check.py)
+
+Migrations live in backend/db/migrations/ as NNNN_name.sql (statements
+separated by ';' at line ends) or NNNN_name.py (an upgrade(cursor)
+function, for steps that depend on the current schema). They run in version
+order and each applied version is recorded in schema_migrations.
+
+Migrations are for the MySQL backend; an embedded SQLite database
+(DB_BACKEND=sqlite) is created from sqlite_schema.sql when first opened.
+
+MySQL commits DDL implicitly, so a migration that fails halfway is not rolled
+back: Python migrations check information_schema before each step so they
+can simply be re-run after the cause is fixed.
+"""
+import argparse
+import importlib
+import os
+import re
+import sys
+from mysql.connector import Error
+from backend.db.connection import DB_BACKEND, get_connection
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+_FILENAME = re.compile(r"^(\d{4})_(\w+)\.(sql|py)$")
+
+
+# ----------------- Helpers for Python migrations -----------------
+def column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def index_exists(cursor, table, index):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, index))
+    return cursor.fetchone()[0] > 0
+
+
+# ----------------- Discovery -----------------
+def list_migrations(directory=MIGRATIONS_DIR):
+    """[(version, name, path)] sorted by version"""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _FILENAME.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), f"{match.group(1)}_{match.group(2)}",
+                               os.path.join(directory, filename)))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Two migrations share a version number")
+    return migrations
+
+
+def split_statements(sql):
+    """Split a .sql migration on ';' at line ends, dropping '--' comment lines"""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in re.split(r";\s*$", "\n".join(lines), flags=re.M) if stmt.strip()]
+
+
+# ----------------- Running -----------------
+def applied_versions(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def apply_migration(conn, cursor, name, path):
+    if path.endswith(".sql"):
+        with open(path, encoding="utf-8") as f:
+            for statement in split_statements(f.read()):
+                cursor.execute(statement)
+    else:
+        module = importlib.import_module(f"backend.db.migrations.{name}")
+        module.upgrade(cursor)
+    conn.commit()
+
+
+def migrate(report=print):
+    """Apply every pending migration in order; returns the names applied"""
+    applied = []
+    with get_connection() as conn:
+        if not conn:
+            raise SystemExit("Could not connect to MySQL")
+
+        cursor = conn.cursor()
+        try:
+            done = applied_versions(cursor)
+            for version, name, path in list_migrations():
+                if version in done:
+                    continue
+                report(f"Applying {name} ...")
+                apply_migration(conn, cursor, name, path)
+                cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+                conn.commit()
+                applied.append(name)
+        finally:
+            cursor.close()
+    return applied
+
+
+def status():
+    """[(name, applied?)] for every migration on disk"""
+    with get_connection() as conn:
+        if not conn:
+            raise SystemExit("Could not connect to MySQL")
+
+        cursor = conn.cursor()
+        try:
+            done = applied_versions(cursor)
+            conn.commit()
+        finally:
+            cursor.close()
+    return [(name, version in done) for version, name, _ in list_migrations()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--status", action="store_true", help="list applied and pending migrations")
+    parser.add_argument("--check", action="store_true", help="EXPLAIN the service queries and flag full scans")
+    args = parser.parse_args(argv)
+
+    if DB_BACKEND == "sqlite" and not args.check:
+        print("DB_BACKEND=sqlite: the schema is created from backend/db/sqlite_schema.sql when the database is opened")
+        return 0
+
+    try:
+        if args.status:
+            for name, applied in status():
+                print(f"{'applied' if applied else 'pending'}  {name}")
+            return 0
+        if args.check:
+            from backend.db.query_check import check_queries
+            return 0 if check_queries() else 1
+
+        applied = migrate()
+        print(f"Applied {len(applied)} migration(s)" if applied else "Schema is up to date")
+        return 0
+    except Error as e:
+        print(f"Migration failed: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+-- Tables as the services use them. IF NOT EXISTS so databases created from
+-- the old README schema keep their data; later migrations bring them in line.
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INT AUTO_INCREMENT PRIMARY KEY,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    height_cm FLOAT,
+    weight_kg FLOAT,
+    age INT,
+    gender ENUM('male','female','other'),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS food_items (
+    food_id INT PRIMARY KEY,
+    name VARCHAR(255),
+    default_serving_size FLOAT DEFAULT 1,
+    calories FLOAT,
+    protein FLOAT,
+    carbs FLOAT,
+    fat FLOAT
+);
+
+CREATE TABLE IF NOT EXISTS food_logs (
+    log_id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT,
+    food_id INT,
+    meal_type ENUM('breakfast','lunch','dinner','snack'),
+    quantity FLOAT,
+    date DATE,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+CREATE TABLE IF NOT EXISTS weight_logs (
+    log_id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT,
+    weight_kg FLOAT,
+    date DATE,
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+CREATE TABLE IF NOT EXISTS daily_nutrition_summary (
+    user_id INT NOT NULL,
+    date DATE NOT NULL,
+    calories FLOAT NOT NULL DEFAULT 0,
+    protein FLOAT NOT NULL DEFAULT 0,
+    carbs FLOAT NOT NULL DEFAULT 0,
+    fat FLOAT NOT NULL DEFAULT 0,
+    entry_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, date),
+    FOREIGN KEY(user_id) REFERENCES users(user_id)
+);
+
+CREATE TABLE IF NOT EXISTS applied_writes (
+    idempotency_key CHAR(36) PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,15 @@
+# backend/db/migrations/0002_weight_logs_date_column.py
+"""
+Bring tables created from the old README schema in line with the services:
+weight_logs.log_date becomes weight_logs.date, and food_items gains the
+default_serving_size column ensure_food() writes.
+"""
+from backend.db.migrate import column_exists
+
+
+def upgrade(cursor):
+    if column_exists(cursor, "weight_logs", "log_date") and not column_exists(cursor, "weight_logs", "date"):
+        cursor.execute("ALTER TABLE weight_logs CHANGE log_date date DATE")
+
+    if not column_exists(cursor, "food_items", "default_serving_size"):
+        cursor.execute("ALTER TABLE food_items ADD COLUMN default_serving_size FLOAT DEFAULT 1 AFTER name")
@@ -0,0 +1,96 @@
+# backend/db/migrations/0003_log_keys_and_indexes.py
+"""
+Unique keys the ON DUPLICATE KEY UPDATE writers rely on, and the indexes the
+per-user date reads need.
+
+food_logs: UNIQUE (user_id, date, meal_type, food_id). Logging the same food
+into the same meal adds to its quantity (log_food / write_food_entries), and
+the (user_id, date) prefix serves every day read.
+
+weight_logs: UNIQUE (user_id, date), one weigh-in per day (write_weight), plus
+(user_id, date, weight_kg) so history/range reads never touch the table rows
+(InnoDB secondary indexes carry log_id already).
+
+Duplicates that the missing keys let in are folded first: repeated food_logs
+rows become one row (the newest log_id) holding their summed quantity, as if
+they had been logged after the key existed. Repeated weigh-ins keep the newest
+row; the dropped weights are printed so they can be re-entered if wanted.
+"""
+from backend.db.migrate import index_exists
+
+REPORT_LIMIT = 20  # duplicate weigh-in days listed individually
+
+
+def upgrade(cursor):
+    if not index_exists(cursor, "food_logs", "uq_food_logs_entry"):
+        merge_food_log_duplicates(cursor)
+        cursor.execute("""
+            ALTER TABLE food_logs
+            ADD UNIQUE KEY uq_food_logs_entry (user_id, date, meal_type, food_id)
+        """)
+
+    if not index_exists(cursor, "weight_logs", "uq_weight_logs_user_date"):
+        report_weight_log_duplicates(cursor)
+        cursor.execute("""
+            DELETE older FROM weight_logs older
+            JOIN weight_logs newer
+              ON newer.user_id = older.user_id AND newer.date = older.date
+             AND newer.log_id > older.log_id
+        """)
+        cursor.execute("ALTER TABLE weight_logs ADD UNIQUE KEY uq_weight_logs_user_date (user_id, date)")
+
+    if not index_exists(cursor, "weight_logs", "idx_weight_logs_history"):
+        cursor.execute("ALTER TABLE weight_logs ADD INDEX idx_weight_logs_history (user_id, date, weight_kg)")
+
+    # Index suggested by the old README; the unique key above makes it redundant
+    if index_exists(cursor, "weight_logs", "idx_weight_logs_user_date"):
+        cursor.execute("ALTER TABLE weight_logs DROP INDEX idx_weight_logs_user_date")
+
+
+def merge_food_log_duplicates(cursor):
+    """Give the newest row of each repeated entry the group's total quantity, then drop the rest"""
+    cursor.execute("DROP TEMPORARY TABLE IF EXISTS food_log_merge")
+    cursor.execute("""
+        CREATE TEMPORARY TABLE food_log_merge AS
+        SELECT MAX(log_id) AS log_id, SUM(quantity) AS quantity, COUNT(*) AS row_count
+        FROM food_logs
+        GROUP BY user_id, date, meal_type, food_id
+        HAVING COUNT(*) > 1
+    """)
+    cursor.execute("SELECT COUNT(*), COALESCE(SUM(row_count), 0) FROM food_log_merge")
+    groups, rows = cursor.fetchone()
+    if groups:
+        cursor.execute("""
+            UPDATE food_logs l
+            JOIN food_log_merge m ON l.log_id = m.log_id
+            SET l.quantity = m.quantity
+        """)
+        cursor.execute("""
+            DELETE older FROM food_logs older
+            JOIN food_logs newer
+              ON newer.user_id = older.user_id AND newer.date = older.date
+             AND newer.meal_type = older.meal_type AND newer.food_id = older.food_id
+             AND newer.log_id > older.log_id
+        """)
+        print(f"food_logs: merged {rows} rows into {groups} entries (quantities summed)")
+    cursor.execute("DROP TEMPORARY TABLE food_log_merge")
+
+
+def report_weight_log_duplicates(cursor):
+    """Print each day with more than one weigh-in: the weight kept and the ones dropped"""
+    cursor.execute("""
+        SELECT user_id, date, CAST(GROUP_CONCAT(weight_kg ORDER BY log_id DESC SEPARATOR ', ') AS CHAR)
+        FROM weight_logs
+        GROUP BY user_id, date
+        HAVING COUNT(*) > 1
+        ORDER BY user_id, date
+    """)
+    duplicates = cursor.fetchall()
+    if not duplicates:
+        return
+    print(f"weight_logs: {len(duplicates)} day(s) have several weigh-ins; keeping the newest of each")
+    for user_id, log_date, weights in duplicates[:REPORT_LIMIT]:
+        kept, dropped = weights.split(", ", 1)
+        print(f"  user {user_id} on {log_date}: kept {kept} kg, dropped {dropped}")
+    if len(duplicates) > REPORT_LIMIT:
+        print(f"  ... and {len(duplicates) - REPORT_LIMIT} more")
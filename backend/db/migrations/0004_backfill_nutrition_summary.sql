@@ -0,0 +1,15 @@
+-- Fill daily_nutrition_summary from existing food logs (same rollup as
+-- python -m backend.services.nutrition_summary --rebuild).
+
+DELETE FROM daily_nutrition_summary;
+
+INSERT INTO daily_nutrition_summary (user_id, date, calories, protein, carbs, fat, entry_count)
+SELECT l.user_id, l.date,
+       COALESCE(SUM(f.calories * l.quantity), 0),
+       COALESCE(SUM(f.protein * l.quantity), 0),
+       COALESCE(SUM(f.carbs * l.quantity), 0),
+       COALESCE(SUM(f.fat * l.quantity), 0),
+       COUNT(*)
+FROM food_logs l
+JOIN food_items f ON l.food_id = f.food_id
+GROUP BY l.user_id, l.date;
@@ -0,0 +1,160 @@
+# backend/db/query_check.py
+"""
+EXPLAIN every per-user service query and flag the ones MySQL would answer
+with a full table scan (type ALL) or a full index scan (type index). On the
+SQLite backend, EXPLAIN QUERY PLAN's SCAN steps are reported the same way.
+
+    python -m backend.db.migrate --check
+
+Run it against a database with realistic data: on near-empty tables the
+optimizer may prefer a scan even when a usable index exists.
+"""
+import re
+from datetime import date, timedelta
+from backend.auth.auth import _LOGIN_SQL
+from backend.db.connection import DB_BACKEND, get_connection
+from backend.services.calendar_service import _MONTH_SQL
+from backend.services.food_log_service import (
+    DAY_FOOD_LOGS_SQL, LOG_DELETE_SQL, LOG_UPDATE_SQL, _DAY_LOG_SQL, _DAY_TOTALS_SQL
+)
+from backend.services.nutrition_summary import _DAY_SUMMARY_SQL, _SUMMARIES_BETWEEN_SQL, refresh_day_summary
+from backend.services.snapshot_service import _PROFILE_SQL
+from backend.services.weight_service import (
+    _HEIGHT_SQL, _WEIGHT_DELETE_SQL, _WEIGHT_HISTORY_SQL, _WEIGHT_LOGS_SQL, _WEIGHT_OWNER_SQL,
+    _WEIGHT_UPDATE_SQL, select_weight_logs
+)
+
+SCAN_TYPES = ("ALL", "index")
+_SQLITE_STEP = re.compile(r"^(SCAN|SEARCH) (\w+)(?: USING (?:COVERING |INTEGER PRIMARY KEY)?(?:INDEX (\w+))?)?")
+_INSERT = re.compile(r"^\s*INSERT\b", re.I)
+_SELECT = re.compile(r"\bSELECT\b", re.I)
+
+_USER_ID = 1
+_TODAY = date.today()
+_MONTH_START = _TODAY.replace(day=1)
+
+
+class _RecordingCursor:
+    """Stands in for a cursor to capture the SQL a cursor-level helper runs"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((sql, tuple(params)))
+
+    def fetchall(self):
+        return []
+
+
+def _recorded(label, helper, *args, **kwargs):
+    cursor = _RecordingCursor()
+    helper(cursor, *args, **kwargs)
+    return [(f"{label} #{i}" if len(cursor.statements) > 1 else label, sql, params)
+            for i, (sql, params) in enumerate(cursor.statements, 1)]
+
+
+def hot_queries():
+    """
+    [(label, sql, params)] with sample parameters for user 1 / today, using
+    the services' own SQL. Plain INSERT ... VALUES writers (the food log and
+    weight upserts) are left out: they touch a single key and EXPLAIN on
+    MySQL reports them as type ALL.
+    """
+    queries = [
+        ("login", _LOGIN_SQL, ("alice",)),
+        ("profile", _PROFILE_SQL, (_USER_ID,)),
+        ("day food logs", DAY_FOOD_LOGS_SQL, (_USER_ID, _TODAY)),
+        ("day log", _DAY_LOG_SQL, (_USER_ID, _TODAY)),
+        ("day totals", _DAY_TOTALS_SQL, (_USER_ID, _TODAY)),
+        ("day summary", _DAY_SUMMARY_SQL, (_USER_ID, _TODAY)),
+        ("summaries between", _SUMMARIES_BETWEEN_SQL, (_USER_ID, _TODAY - timedelta(days=30), _TODAY)),
+        ("calendar month", _MONTH_SQL,
+         (_USER_ID, _MONTH_START, _TODAY, _USER_ID, _MONTH_START, _TODAY)),
+        ("food log update", LOG_UPDATE_SQL, (1, _USER_ID, 1, _TODAY, "lunch")),
+        ("food log delete", LOG_DELETE_SQL, (_USER_ID, 1, _TODAY, "lunch")),
+        ("weight logs", _WEIGHT_LOGS_SQL, (_USER_ID,)),
+        ("weight history", _WEIGHT_HISTORY_SQL, (_USER_ID,)),
+        ("weight by id", _WEIGHT_OWNER_SQL, (1,)),
+        ("weight update", _WEIGHT_UPDATE_SQL, (70, 1)),
+        ("weight delete", _WEIGHT_DELETE_SQL, (1,)),
+        ("height", _HEIGHT_SQL, (_USER_ID,)),
+    ]
+    queries += _recorded("weight latest page", select_weight_logs, _USER_ID, limit=180, newest_first=True)
+    queries += _recorded("weight older page", select_weight_logs, _USER_ID, before=_TODAY, limit=180,
+                         newest_first=True)
+    queries += _recorded("weight next page", select_weight_logs, _USER_ID, after=_TODAY - timedelta(days=365),
+                         limit=180)
+    queries += _recorded("weight range", select_weight_logs, _USER_ID,
+                         start_date=_TODAY - timedelta(days=90), end_date=_TODAY)
+    queries += _recorded("summary refresh", refresh_day_summary, _USER_ID, _TODAY)
+    return queries
+
+
+def explainable(sql, params):
+    """
+    The (sql, params) worth EXPLAINing: INSERT ... SELECT is reduced to its
+    SELECT, since EXPLAIN shows the insert target as a full scan; a plain
+    INSERT ... VALUES reads nothing and gives None.
+    """
+    if not _INSERT.match(sql):
+        return sql, params
+    match = _SELECT.search(sql)
+    if not match:
+        return None
+    skipped = sql[:match.start()].count("%s")  # placeholders in the INSERT part
+    return sql[match.start():], tuple(params)[skipped:]
+
+
+def explain(cursor, sql, params):
+    """EXPLAIN rows as dicts; derived tables (<union1,2>, <derived2>) are left out"""
+    if DB_BACKEND == "sqlite":
+        return _explain_sqlite(cursor, sql, params)
+    cursor.execute("EXPLAIN " + sql, params)
+    return [row for row in cursor.fetchall() if not (row["table"] or "").startswith("<")]
+
+
+def _explain_sqlite(cursor, sql, params):
+    """EXPLAIN QUERY PLAN table steps in the same shape (SCAN -> ALL / index, SEARCH -> ref)"""
+    cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+    rows = []
+    for step in cursor.fetchall():
+        match = _SQLITE_STEP.match(step["detail"])
+        if not match:
+            continue  # temp b-trees, compound query markers
+        kind, table, key = match.groups()
+        if kind == "SCAN":
+            kind = "index" if "INDEX" in step["detail"] else "ALL"
+        else:
+            kind = "ref"
+        rows.append({"table": table, "type": kind, "key": key or ("PRIMARY" if "PRIMARY" in step["detail"] else None),
+                     "rows": None})
+    return rows
+
+
+def check_queries(queries=None, report=print):
+    """EXPLAIN each query; returns True if none of them scans a whole table or index"""
+    queries = queries if queries is not None else hot_queries()
+    ok = True
+    with get_connection() as conn:
+        if not conn:
+            raise SystemExit("Could not connect to the database")
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            for label, sql, params in queries:
+                target = explainable(sql, params)
+                if target is None:
+                    report(f"skip  {label}: INSERT ... VALUES")
+                    continue
+                for row in explain(cursor, *target):
+                    if row["type"] in SCAN_TYPES:
+                        ok = False
+                        report(f"SCAN  {label}: {row['table']} type={row['type']} key={row['key']} "
+                               f"rows={row['rows']}")
+                    else:
+                        report(f"ok    {label}: {row['table']} type={row['type']} key={row['key']}")
+            conn.rollback()
+        finally:
+            cursor.close()
+    return ok
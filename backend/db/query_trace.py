@@ -0,0 +1,309 @@
+# backend/db/query_trace.py
+"""
+Per-query latency tracing for pooled connections.
+
+While tracing is on, get_connection() hands out a thin wrapper whose cursors
+time every execute/executemany (plus the fetches that follow), count the
+rows returned and note the service function that issued the statement.
+Timings go into fixed-bucket histograms per (function, statement), each
+identified by query_id (a short hash of the statement text); statements
+slower than QUERY_SLOW_MS are printed and kept in a short slow-query log.
+When tracing is off the raw connection is handed out and the only cost is
+one flag check per checkout.
+
+    from backend.db import query_trace
+    query_trace.enable_tracing()
+    ...
+    print(query_trace.export_prometheus())   # or export_json()
+
+Set QUERY_TRACE=1 to start with tracing on, and QUERY_TRACE_FILE=path.json
+(or path.prom) to write the export when the process exits.
+"""
+import atexit
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+
+TRACE_ENABLED = os.getenv("QUERY_TRACE", "0") == "1"
+SLOW_QUERY_MS = float(os.getenv("QUERY_SLOW_MS", "200"))
+TRACE_FILE = os.getenv("QUERY_TRACE_FILE")
+SLOW_LOG_SIZE = 100
+
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_WHITESPACE = re.compile(r"\s+")
+_SKIP_MODULES = ("backend.db.connection", "backend.db.query_trace")
+_SERVICE_MODULES = ("backend.services.", "backend.auth.")
+QUERY_ID_LENGTH = 12
+
+
+class QueryStats:
+    """Latency histogram and row count for one (function, statement)"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # last one is +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+
+    def add(self, ms, rows):
+        index = 0
+        while index < len(BUCKETS_MS) and ms > BUCKETS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.rows += max(rows, 0)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of calls"""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return 0.0
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "rows": self.rows,
+            "buckets": dict(zip([str(b) for b in BUCKETS_MS] + ["+Inf"], self.buckets)),
+        }
+
+
+class QueryTracer:
+    """Collects QueryStats and the slow-query log; thread-safe"""
+
+    def __init__(self, enabled=TRACE_ENABLED, slow_ms=SLOW_QUERY_MS):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self._stats = {}  # (function, statement) -> QueryStats
+        self._slow = deque(maxlen=SLOW_LOG_SIZE)
+        self._lock = threading.Lock()
+
+    def record(self, function, sql, ms, rows):
+        statement = _WHITESPACE.sub(" ", sql).strip()
+        with self._lock:
+            stats = self._stats.get((function, statement))
+            if stats is None:
+                stats = self._stats[(function, statement)] = QueryStats()
+            stats.add(ms, rows)
+            slow = ms >= self.slow_ms
+            if slow:
+                self._slow.append({"at": time.time(), "function": function, "query_id": query_id(statement),
+                                   "statement": statement, "ms": round(ms, 3), "rows": rows})
+        if slow:
+            print(f"Slow query ({ms:.0f} ms, {rows} rows) in {function}: {statement[:200]}")
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+
+    def snapshot(self):
+        """{"queries": [...], "slow_queries": [...]} sorted by total time, slowest first"""
+        with self._lock:
+            queries = [dict(function=function, query_id=query_id(statement), statement=statement, **stats.to_dict())
+                       for (function, statement), stats in self._stats.items()]
+            slow = list(self._slow)
+        queries.sort(key=lambda q: q["total_ms"], reverse=True)
+        return {"enabled": self.enabled, "slow_ms": self.slow_ms, "queries": queries, "slow_queries": slow}
+
+
+def query_id(statement):
+    """Stable short id for a normalized statement, unique where a truncated text is not"""
+    return hashlib.sha1(statement.encode("utf-8")).hexdigest()[:QUERY_ID_LENGTH]
+
+
+# ----------------- Connection / cursor wrappers -----------------
+def _caller():
+    """
+    module.function of the outermost service-layer frame, so statements run by
+    cursor-level helpers (refresh_day_summary, select_weight_logs, ...) count
+    towards the service call that issued them; failing that, the nearest
+    frame outside the db layer
+    """
+    frame = sys._getframe(1)
+    nearest = outermost = None
+    while frame is not None:
+        name = frame.f_globals.get("__name__", "")
+        if nearest is None and not name.startswith(_SKIP_MODULES):
+            nearest = frame
+        if name.startswith(_SERVICE_MODULES):
+            outermost = frame
+        frame = frame.f_back
+    frame = outermost or nearest
+    if frame is None:
+        return "?"
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+class TracedCursor:
+    """
+    Cursor wrapper. A statement's record (execute time + fetch time, rows
+    fetched) is written when the next statement starts or the cursor closes.
+    """
+
+    def __init__(self, cursor, tracer):
+        self._cursor = cursor
+        self._tracer = tracer
+        self._pending = None  # [function, sql, ms, rows]
+
+    def execute(self, sql, params=(), *args, **kwargs):
+        self._finish()
+        function = _caller()
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, params, *args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            rows = self._cursor.rowcount if self._cursor.description is None else 0
+            self._pending = [function, sql, ms, rows]
+
+    def executemany(self, sql, seq_params, *args, **kwargs):
+        self._finish()
+        function = _caller()
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, seq_params, *args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - started) * 1000
+            self._pending = [function, sql, ms, self._cursor.rowcount]
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone, lambda row: int(row is not None))
+
+    def fetchmany(self, size=1):
+        return self._fetch(lambda: self._cursor.fetchmany(size), len)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall, len)
+
+    def _fetch(self, fetch, count):
+        started = time.perf_counter()
+        result = fetch()
+        if self._pending is not None:
+            self._pending[2] += (time.perf_counter() - started) * 1000
+            self._pending[3] += count(result)
+        return result
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    def _finish(self):
+        if self._pending is not None:
+            function, sql, ms, rows = self._pending
+            self._pending = None
+            self._tracer.record(function, sql, ms, rows)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class TracedConnection:
+    """Connection wrapper whose cursor() returns TracedCursors"""
+
+    def __init__(self, conn, tracer):
+        self._conn = conn
+        self._tracer = tracer
+        self._cursors = []
+
+    def cursor(self, *args, **kwargs):
+        cursor = TracedCursor(self._conn.cursor(*args, **kwargs), self._tracer)
+        self._cursors.append(cursor)
+        return cursor
+
+    def finish(self):
+        """Write out records of cursors the caller never closed"""
+        for cursor in self._cursors:
+            cursor._finish()
+        self._cursors = []
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+# ----------------- Shared tracer -----------------
+tracer = QueryTracer()
+
+
+def trace_connection(conn):
+    """Wrap conn for tracing, or return it untouched when tracing is off"""
+    if not tracer.enabled or conn is None:
+        return conn
+    return TracedConnection(conn, tracer)
+
+
+def enable_tracing(slow_ms=None):
+    if slow_ms is not None:
+        tracer.slow_ms = slow_ms
+    tracer.enabled = True
+
+
+def disable_tracing():
+    tracer.enabled = False
+
+
+def tracing_enabled():
+    return tracer.enabled
+
+
+def reset_tracing():
+    tracer.reset()
+
+
+# ----------------- Export -----------------
+def export_json(indent=2):
+    return json.dumps(tracer.snapshot(), indent=indent)
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def export_prometheus():
+    """Prometheus text exposition format (histogram + rows counter per query)"""
+    lines = [
+        "# HELP calorie_tracker_query_duration_ms Time spent executing and fetching a query.",
+        "# TYPE calorie_tracker_query_duration_ms histogram",
+    ]
+    rows_lines = [
+        "# HELP calorie_tracker_query_rows_total Rows returned or affected by a query.",
+        "# TYPE calorie_tracker_query_rows_total counter",
+    ]
+    for query in tracer.snapshot()["queries"]:
+        labels = (f'function="{_label(query["function"])}",query_id="{query["query_id"]}",'
+                  f'statement="{_label(query["statement"][:120])}"')
+        cumulative = 0
+        for bound, count in query["buckets"].items():
+            cumulative += count
+            lines.append(f'calorie_tracker_query_duration_ms_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"calorie_tracker_query_duration_ms_sum{{{labels}}} {query['total_ms']}")
+        lines.append(f"calorie_tracker_query_duration_ms_count{{{labels}}} {query['count']}")
+        rows_lines.append(f"calorie_tracker_query_rows_total{{{labels}}} {query['rows']}")
+    return "\n".join(lines + rows_lines) + "\n"
+
+
+def write_export(path):
+    """Write export_prometheus() for *.prom paths, export_json() otherwise"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(export_prometheus() if path.endswith(".prom") else export_json())
+
+
+if TRACE_FILE:
+    atexit.register(write_export, TRACE_FILE)
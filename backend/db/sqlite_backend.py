@@ -0,0 +1,194 @@
+# backend/db/sqlite_backend.py
+"""
+Embedded SQLite storage backend (DB_BACKEND=sqlite).
+
+Connections behave like mysql.connector ones as far as the services are
+concerned, so the services run unchanged:
+
+- %s placeholders, INSERT IGNORE and ON DUPLICATE KEY UPDATE are rewritten
+  into SQLite syntax (upserts without a conflict target need SQLite 3.35+)
+- cursor(dictionary=True) returns rows as dicts
+- DATE columns come back as datetime.date
+- sqlite3 errors are raised as the matching mysql.connector error classes
+
+The database file (SQLITE_PATH) runs in WAL mode, so reads don't block the
+write-journal flusher, and is created from sqlite_schema.sql on first open.
+"""
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+from mysql.connector import errors
+
+SQLITE_PATH = os.getenv("SQLITE_PATH", "data/calorie_tracker.sqlite3")
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sqlite_schema.sql")
+BUSY_TIMEOUT_SECONDS = 10
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+_INSERT_IGNORE = re.compile(r"\bINSERT\s+IGNORE\b", re.I)
+_UPSERT = re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b(.*)$", re.I | re.S)
+_VALUES_REF = re.compile(r"\bVALUES\((\w+)\)", re.I)
+_NO_OP = re.compile(r"^(\w+)\s*=\s*\1$")
+
+_schema_ready = set()  # database paths the schema has been applied to
+_schema_lock = threading.Lock()
+
+
+@lru_cache(maxsize=512)
+def translate_sql(sql):
+    """Rewrite the MySQL dialect the services use into SQLite"""
+    sql = _INSERT_IGNORE.sub("INSERT OR IGNORE", sql)
+    match = _UPSERT.search(sql)
+    if match:
+        updates = [a.strip() for a in match.group(1).split(",") if not _NO_OP.match(a.strip())]
+        if updates:
+            clause = "ON CONFLICT DO UPDATE SET " + ", ".join(_VALUES_REF.sub(r"excluded.\1", a) for a in updates)
+        else:
+            clause = "ON CONFLICT DO NOTHING"
+        sql = sql[:match.start()] + clause
+    return sql.replace("%s", "?")
+
+
+def _mysql_error(e):
+    """The mysql.connector error the services expect for a sqlite3 error"""
+    message = str(e)
+    if isinstance(e, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=message)
+    if isinstance(e, sqlite3.OperationalError):
+        if "locked" in message or "unable to open" in message or "disk I/O" in message:
+            return errors.OperationalError(msg=message)
+        return errors.ProgrammingError(msg=message)  # syntax errors, missing tables/columns
+    if isinstance(e, (sqlite3.ProgrammingError, sqlite3.InterfaceError)):
+        return errors.InterfaceError(msg=message)
+    return errors.DatabaseError(msg=message)
+
+
+class SQLiteCursor:
+    """mysql.connector-style cursor over a sqlite3 cursor"""
+
+    def __init__(self, cursor, dictionary=False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    def execute(self, sql, params=()):
+        try:
+            self._cursor.execute(translate_sql(sql), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+
+    def executemany(self, sql, seq_params):
+        try:
+            self._cursor.executemany(translate_sql(sql), [tuple(p) for p in seq_params])
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        return self._row(row) if row is not None else None
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    def _row(self, row):
+        if self._dictionary:
+            return dict(zip(self.column_names, row))
+        return row
+
+    @property
+    def column_names(self):
+        return tuple(column[0] for column in self._cursor.description or ())
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def with_rows(self):
+        return self._cursor.description is not None
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """The part of the mysql.connector connection API the pool and services use"""
+
+    def __init__(self, db):
+        self._db = db
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self._db.cursor(), dictionary=dictionary)
+
+    @property
+    def in_transaction(self):
+        return self._db.in_transaction
+
+    def commit(self):
+        self._call(self._db.commit)
+
+    def rollback(self):
+        self._call(self._db.rollback)
+
+    def ping(self, reconnect=False, **kwargs):
+        self._call(self._db.execute, "SELECT 1")
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except errors.Error:
+            return False
+
+    def close(self):
+        self._db.close()
+
+    @staticmethod
+    def _call(method, *args):
+        try:
+            return method(*args)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+
+
+def ensure_schema(db, path):
+    """Apply sqlite_schema.sql the first time this process opens path"""
+    with _schema_lock:
+        if path in _schema_ready:
+            return
+        with open(SCHEMA_PATH, encoding="utf-8") as f:
+            db.executescript(f.read())
+        _schema_ready.add(path)
+
+
+def create_sqlite_connection(path=None):
+    """Open the SQLite database (creating file and schema if needed); None on failure"""
+    path = path or SQLITE_PATH
+    try:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        db = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False,
+                             detect_types=sqlite3.PARSE_DECLTYPES)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        ensure_schema(db, path)
+        return SQLiteConnection(db)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error opening SQLite database {path}: {e}")
+        return None
@@ -0,0 +1,60 @@
+-- Schema for the embedded SQLite backend (DB_BACKEND=sqlite): the tables,
+-- keys and indexes that the MySQL migrations in migrations/ produce.
+-- Applied when a database file is first opened; every statement is idempotent.
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    height_cm FLOAT,
+    weight_kg FLOAT,
+    age INT,
+    gender TEXT CHECK (gender IN ('male','female','other')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS food_items (
+    food_id INT PRIMARY KEY,
+    name VARCHAR(255),
+    default_serving_size FLOAT DEFAULT 1,
+    calories FLOAT,
+    protein FLOAT,
+    carbs FLOAT,
+    fat FLOAT
+);
+
+CREATE TABLE IF NOT EXISTS food_logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INT REFERENCES users(user_id),
+    food_id INT,
+    meal_type TEXT CHECK (meal_type IN ('breakfast','lunch','dinner','snack')),
+    quantity FLOAT,
+    date DATE,
+    CONSTRAINT uq_food_logs_entry UNIQUE (user_id, date, meal_type, food_id)
+);
+
+CREATE TABLE IF NOT EXISTS weight_logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INT REFERENCES users(user_id),
+    weight_kg FLOAT,
+    date DATE,
+    CONSTRAINT uq_weight_logs_user_date UNIQUE (user_id, date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_weight_logs_history ON weight_logs (user_id, date, weight_kg);
+
+CREATE TABLE IF NOT EXISTS daily_nutrition_summary (
+    user_id INT NOT NULL REFERENCES users(user_id),
+    date DATE NOT NULL,
+    calories FLOAT NOT NULL DEFAULT 0,
+    protein FLOAT NOT NULL DEFAULT 0,
+    carbs FLOAT NOT NULL DEFAULT 0,
+    fat FLOAT NOT NULL DEFAULT 0,
+    entry_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, date)
+);
+
+CREATE TABLE IF NOT EXISTS applied_writes (
+    idempotency_key CHAR(36) PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,131 @@
+# backend/services/calendar_service.py
+"""
+Per-month data for the dashboard calendar heatmap.
+
+A month is read with one range query (daily_nutrition_summary UNION
+weight_logs) and cached per (user_id, year, month). Writers call
+invalidate_month() for the day they touched; prefetch_adjacent_months()
+warms the previous and next month on a background thread.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from backend.db.connection import get_connection
+from backend.cache.memory_cache import LRUCache
+
+MONTH_CACHE_MAX_ENTRIES = int(os.getenv("MONTH_CACHE_MAX_ENTRIES", "36"))
+
+_month_cache = LRUCache(max_entries=MONTH_CACHE_MAX_ENTRIES)
+_versions = {}  # user_id -> bumped on each invalidation of one of their months (one entry per user)
+_versions_lock = threading.Lock()
+
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+_MONTH_SQL = """
+    SELECT date, calories, 0 AS weighed
+    FROM daily_nutrition_summary
+    WHERE user_id = %s AND date >= %s AND date < %s
+    UNION ALL
+    SELECT date, NULL, 1
+    FROM weight_logs
+    WHERE user_id = %s AND date >= %s AND date < %s
+"""
+
+
+def month_bounds(year, month):
+    """(first day, first day of the next month)"""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def shift_month(year, month, delta):
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+# ----------------- Reads -----------------
+def get_month_overview(user_id, year, month):
+    """
+    {date: {"calories": float or None, "weighed": bool}} for every day of the
+    month with food or weight logged. Cached until invalidate_month().
+    """
+    key = (user_id, year, month)
+    overview = _month_cache.get(key)
+    if overview is None:
+        overview = _load_month(key)
+    return overview
+
+
+def get_cached_month_overview(user_id, year, month):
+    """The cached overview, or None without querying"""
+    return _month_cache.get((user_id, year, month))
+
+
+def get_month_overview_async(user_id, year, month):
+    """get_month_overview on a background thread; returns a Future"""
+    return _get_prefetch_executor().submit(get_month_overview, user_id, year, month)
+
+
+def _load_month(key):
+    user_id = key[0]
+    with _versions_lock:
+        version = _versions.get(user_id, 0)
+
+    overview = _fetch_month(*key)
+
+    # Don't cache a read that raced with a write by the same user
+    with _versions_lock:
+        if _versions.get(user_id, 0) == version:
+            _month_cache.put(key, overview)
+    return overview
+
+
+def _fetch_month(user_id, year, month):
+    start, end = month_bounds(year, month)
+    overview = {}
+    with get_connection() as conn:
+        if not conn:
+            return overview
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute(_MONTH_SQL, (user_id, start, end, user_id, start, end))
+            for day, calories, weighed in cursor.fetchall():
+                entry = overview.setdefault(day, {"calories": None, "weighed": False})
+                if weighed:
+                    entry["weighed"] = True
+                else:
+                    entry["calories"] = float(calories)
+        finally:
+            cursor.close()
+    return overview
+
+
+def prefetch_adjacent_months(user_id, year, month):
+    """Load the previous and next month in the background if not cached"""
+    executor = _get_prefetch_executor()
+    for delta in (-1, 1):
+        key = (user_id, *shift_month(year, month, delta))
+        if key not in _month_cache:
+            executor.submit(_load_month, key)
+
+
+def _get_prefetch_executor():
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _prefetch_executor_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="calendar-prefetch")
+    return _prefetch_executor
+
+
+# ----------------- Invalidation -----------------
+def invalidate_month(user_id, day):
+    """Drop the cached month containing day (call after writing logs for it)"""
+    key = (user_id, day.year, day.month)
+    with _versions_lock:
+        _versions[user_id] = _versions.get(user_id, 0) + 1
+        _month_cache.invalidate(key)
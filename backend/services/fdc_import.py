@@ -0,0 +1,216 @@
+# backend/services/fdc_import.py
+"""
+Bulk-load a FoodData Central download into food_items.
+
+    python -m backend.services.fdc_import FoodData_Central_sr_legacy_food_json.json
+    python -m backend.services.fdc_import FoodData_Central_csv_2024-04-18/
+
+Accepts the JSON download or the CSV folder (food.csv + food_nutrient.csv).
+Records are streamed and written in batches, so memory stays bounded (the CSV
+import keeps one fdc_id -> description map). Progress is checkpointed after
+each batch; rerunning the same command resumes where it stopped.
+
+Re-importing a food whose nutrients changed also refreshes the
+daily_nutrition_summary days that log it, in the same transaction.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from mysql.connector import Error
+from backend.db.connection import get_connection
+from backend.services.food_log_service import food_logs_changed
+from backend.services.nutrients import NUTRIENT_IDS, food_from_usda, iter_dump_foods
+from backend.services.nutrition_summary import refresh_day_summaries
+
+BATCH_SIZE = 1000
+NAME_MAX_LEN = 255  # food_items.name is VARCHAR(255)
+
+UPSERT_SQL = """
+    INSERT INTO food_items (food_id, name, calories, protein, carbs, fat)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        name = VALUES(name),
+        calories = VALUES(calories),
+        protein = VALUES(protein),
+        carbs = VALUES(carbs),
+        fat = VALUES(fat)
+"""
+
+
+# ----------------- Readers -----------------
+def iter_csv_foods(folder):
+    """
+    Join food.csv with food_nutrient.csv in one streaming pass. FDC ships
+    food_nutrient.csv grouped by fdc_id, so each food is emitted as soon as
+    its group ends. Only nutrients we map are kept.
+
+    Raises ValueError if an fdc_id shows up again after its group ended
+    (an unsorted or concatenated file), rather than splitting the food.
+    """
+    csv.field_size_limit(sys.maxsize)
+    names = {}
+    with open(os.path.join(folder, "food.csv"), newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            names[row["fdc_id"]] = row["description"]
+
+    current_id, nutrients = None, []
+    finished = set()  # fdc_ids whose group has ended
+    with open(os.path.join(folder, "food_nutrient.csv"), newline="", encoding="utf-8") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            fdc_id = row["fdc_id"]
+            if fdc_id != current_id:
+                if fdc_id in finished:
+                    raise ValueError(
+                        f"food_nutrient.csv line {line}: fdc_id {fdc_id} appears again after its rows ended; "
+                        "the file must be grouped by fdc_id (sort it by fdc_id and rerun with --restart)"
+                    )
+                if current_id is not None:
+                    finished.add(current_id)
+                if current_id in names:
+                    yield _csv_food(current_id, names[current_id], nutrients)
+                current_id, nutrients = fdc_id, []
+            nutrient_id = int(row["nutrient_id"])
+            if nutrient_id in NUTRIENT_IDS and row["amount"]:
+                nutrients.append({"nutrientId": nutrient_id, "value": float(row["amount"])})
+        if current_id in names:
+            yield _csv_food(current_id, names[current_id], nutrients)
+
+
+def _csv_food(fdc_id, description, nutrients):
+    return food_from_usda({"fdcId": fdc_id, "description": description, "foodNutrients": nutrients})
+
+
+def iter_source(path):
+    if os.path.isdir(path):
+        return iter_csv_foods(path)
+    return iter_dump_foods(path)
+
+
+# ----------------- Checkpoints -----------------
+def load_checkpoint(path, source):
+    try:
+        with open(path, "r") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return 0
+    return state.get("records", 0) if state.get("source") == os.path.abspath(source) else 0
+
+
+def save_checkpoint(path, source, records):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"source": os.path.abspath(source), "records": records}, f)
+    os.replace(tmp, path)  # atomic, so a crash never leaves a torn checkpoint
+
+
+# ----------------- Import -----------------
+def import_foods(source, checkpoint_path, batch_size=BATCH_SIZE, restart=False, report=print):
+    """Stream source into food_items. Returns the number of rows written this run."""
+    skip = 0 if restart else load_checkpoint(checkpoint_path, source)
+    if skip:
+        report(f"Resuming after {skip} records")
+
+    written = 0
+    started = time.monotonic()
+    with get_connection() as conn:
+        if not conn:
+            raise SystemExit("Could not connect to MySQL")
+        cursor = conn.cursor()
+        batch = []
+        records = 0
+        for food in iter_source(source):
+            records += 1
+            if records <= skip:
+                continue
+            batch.append((
+                int(food["food_id"]),
+                food["name"][:NAME_MAX_LEN],
+                food["calories"],
+                food["protein"],
+                food["carbs"],
+                food["fat"],
+            ))
+            if len(batch) >= batch_size:
+                written += _flush(conn, cursor, batch)
+                save_checkpoint(checkpoint_path, source, records)
+                _report_progress(report, records, written, started)
+                batch = []
+        if batch:
+            written += _flush(conn, cursor, batch)
+            save_checkpoint(checkpoint_path, source, records)
+        cursor.close()
+
+    _report_progress(report, skip + written, written, started, done=True)
+    return written
+
+
+def _flush(conn, cursor, batch):
+    changed = _changed_food_ids(cursor, batch)
+    cursor.executemany(UPSERT_SQL, batch)
+    days = _logged_days(cursor, changed)
+    refresh_day_summaries(cursor, days)
+    conn.commit()
+    for user_id, log_date in days:
+        food_logs_changed(user_id, log_date)
+    return len(batch)
+
+
+def _changed_food_ids(cursor, batch):
+    """food_ids in batch that are already in food_items with different nutrients"""
+    placeholders = ", ".join(["%s"] * len(batch))
+    cursor.execute(
+        f"SELECT food_id, calories, protein, carbs, fat FROM food_items WHERE food_id IN ({placeholders})",
+        [row[0] for row in batch]
+    )
+    stored = {row[0]: row[1:] for row in cursor.fetchall()}
+    return [row[0] for row in batch if row[0] in stored and not _same_nutrients(stored[row[0]], row[2:])]
+
+
+def _same_nutrients(old, new):
+    # food_items columns are single-precision FLOAT, so compare loosely
+    return all(
+        a is None and b is None or
+        a is not None and b is not None and math.isclose(a, b, rel_tol=1e-5, abs_tol=1e-6)
+        for a, b in zip(old, new)
+    )
+
+
+def _logged_days(cursor, food_ids):
+    """Distinct (user_id, date) with food_logs for any of food_ids"""
+    if not food_ids:
+        return []
+    placeholders = ", ".join(["%s"] * len(food_ids))
+    cursor.execute(f"SELECT DISTINCT user_id, date FROM food_logs WHERE food_id IN ({placeholders})", food_ids)
+    return cursor.fetchall()
+
+
+def _report_progress(report, records, written, started, done=False):
+    elapsed = max(time.monotonic() - started, 1e-9)
+    prefix = "Done:" if done else "Imported"
+    report(f"{prefix} {written} rows this run ({records} records total) in {elapsed:.1f}s, {written / elapsed:,.0f} rows/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a FoodData Central dump into food_items")
+    parser.add_argument("source", help="FDC JSON file or CSV folder")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--checkpoint", default="data/fdc_import.checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="ignore any saved checkpoint")
+    args = parser.parse_args(argv)
+
+    if os.path.dirname(args.checkpoint):
+        os.makedirs(os.path.dirname(args.checkpoint), exist_ok=True)
+    try:
+        import_foods(args.source, args.checkpoint, args.batch_size, args.restart)
+    except (Error, ValueError) as e:
+        print(f"Import failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,59 @@
-from backend.db.connection import create_connection
+import datetime
+from mysql.connector import Error
+from backend.db.connection import get_connection
+from backend.services.nutrition_summary import refresh_day_summary
+from backend.services.calendar_service import invalidate_month
+from backend.cache.day_cache import get_day_cache
+
+FOOD_UPSERT_SQL = """
+    INSERT INTO food_items (food_id, name, calories, protein, carbs, fat)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE food_id = food_id
+"""
+
+LOG_INSERT_SQL = """
+    INSERT INTO food_logs (user_id, food_id, date, meal_type, quantity)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE quantity = quantity + VALUES(quantity)
+"""
+
+LOG_UPDATE_SQL = """
+    UPDATE food_logs
+    SET quantity = %s
+    WHERE user_id = %s AND food_id = %s AND date = %s AND meal_type = %s
+"""
+
+LOG_DELETE_SQL = """
+    DELETE FROM food_logs
+    WHERE user_id = %s AND food_id = %s AND date = %s AND meal_type = %s
+"""
+
+# One day's entries with per-row totals (food screen and dashboard snapshot)
+DAY_FOOD_LOGS_SQL = """
+    SELECT fl.log_id, fl.food_id, fl.date, f.name, fl.meal_type, fl.quantity,
+        f.calories * fl.quantity AS total_calories,
+        f.protein * fl.quantity AS total_protein,
+        f.carbs * fl.quantity AS total_carbs,
+        f.fat * fl.quantity AS total_fat
+    FROM food_logs fl
+    JOIN food_items f ON fl.food_id = f.food_id
+    WHERE fl.user_id = %s AND fl.date = %s
+    ORDER BY fl.meal_type
+"""
+
+_DAY_LOG_SQL = """
+    SELECT f.name, f.calories, f.protein, f.carbs, f.fat,
+           l.quantity, l.meal_type
+    FROM food_logs l
+    JOIN food_items f ON l.food_id = f.food_id
+    WHERE l.user_id = %s AND l.date = %s
+"""
+
+_DAY_TOTALS_SQL = """
+    SELECT calories, protein, carbs, fat
+    FROM daily_nutrition_summary
+    WHERE user_id = %s AND date = %s
+"""
 
 # -----------------------------
 # Ensure a food exists in cache
@@ -6,80 +61,132 @@ from backend.db.connection import create_connection
 
 def ensure_food(food_id, name, calories, protein, carbs, fat, serving_size=1):
     """
-    Insert food into food_items if it does not already exist
+    Insert food into food_items if it does not already exist.
+    Returns False if the database is unreachable.
     """
-    conn = create_connection()
-    cursor = conn.cursor()
+    with get_connection() as conn:
+        if not conn:
+            return False
 
-    cursor.execute("SELECT food_id FROM food_items WHERE food_id = %s", (food_id,))
-    exists = cursor.fetchone()
-
-    if not exists:
+        cursor = conn.cursor()
         cursor.execute("""
             INSERT INTO food_items (food_id, name, default_serving_size, calories, protein, carbs, fat)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE food_id = food_id
         """, (food_id, name, serving_size, calories, protein, carbs, fat))
         conn.commit()
+        cursor.close()
+    return True
 
-    cursor.close()
-    conn.close()
+# -----------------------------
+# Logging
+# -----------------------------
 
-def log_food(user_id, food_id, name, calories, protein, carbs, fat, date, meal_type, quantity):
-    """
-    Adds a food entry for a user on a specific day & meal
+def log_food_entries(user_id, entries, log_date=None):
     """
-    ensure_food(food_id, name, calories, protein, carbs, fat)
+    Log many foods in one transaction on one connection, e.g. a saved meal.
 
-    conn = create_connection()
-    cursor = conn.cursor()
+    entries: [{"food": {food_id, name, calories, protein, carbs, fat}, "meal_type": ..., "quantity": ...}]
 
-    cursor.execute("""
-        INSERT INTO food_logs (user_id, food_id, date, meal_type, quantity)
-        VALUES (%s, %s, %s, %s, %s)
-    """, (user_id, food_id, date, meal_type, quantity))
+    Logging a food that is already in that meal on that day adds to its
+    quantity; use update_food_log_quantity to set a quantity instead.
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+    Every food is upserted into food_items, every log row inserted and the
+    day's daily_nutrition_summary row refreshed before a single commit; on
+    error nothing is written. Returns False if the database is unreachable.
+    """
+    log_date = log_date or datetime.date.today()
+
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            write_food_entries(cursor, user_id, entries, log_date)
+            conn.commit()
+        except Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    food_logs_changed(user_id, log_date)
+    return True
+
+def write_food_entries(cursor, user_id, entries, log_date):
+    """
+    The statements behind log_food_entries, on the caller's cursor and
+    transaction (the caller commits, then calls food_logs_changed)
+    """
+    foods = {str(e["food"]["food_id"]): e["food"] for e in entries}
+    food_rows = [
+        (
+            food["food_id"],
+            food["name"],
+            food.get("calories", 0),
+            food.get("protein", 0),
+            food.get("carbs", 0),
+            food.get("fat", 0)
+        )
+        for _, food in sorted(foods.items())  # fixed lock order across writers
+    ]
+    log_rows = [(user_id, e["food"]["food_id"], log_date, e["meal_type"], e["quantity"]) for e in entries]
+
+    cursor.executemany(FOOD_UPSERT_SQL, food_rows)
+    cursor.executemany(LOG_INSERT_SQL, log_rows)
+    refresh_day_summary(cursor, user_id, log_date)
+
+def food_logs_changed(user_id, log_date):
+    """Drop cached views of a day after its food logs were committed"""
+    invalidate_month(user_id, log_date)
+    get_day_cache().invalidate_day(user_id, log_date)
+
+def log_food_entry(user_id, food, meal_type, quantity, log_date=None):
+    """
+    Upsert one food and log it in a single transaction (adding to the
+    quantity if the food is already in that meal, see log_food_entries)
+    """
+    return log_food_entries(user_id, [{"food": food, "meal_type": meal_type, "quantity": quantity}], log_date)
+
+def log_food(user_id, food_id, name, calories, protein, carbs, fat, date, meal_type, quantity):
+    """
+    Adds a food entry for a user on a specific day & meal, or adds quantity
+    to the entry already there
+    """
+    food = {"food_id": food_id, "name": name, "calories": calories, "protein": protein, "carbs": carbs, "fat": fat}
+    return log_food_entry(user_id, food, meal_type, quantity, date)
 
 def get_day_log(user_id, date):
     """
     Returns all food entries for a user on a given date
     """
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
+    with get_connection() as conn:
+        if not conn:
+            return []
 
-    cursor.execute("""
-        SELECT f.name, f.calories, f.protein, f.carbs, f.fat,
-               l.quantity, l.meal_type
-        FROM food_logs l
-        JOIN food_items f ON l.food_id = f.food_id
-        WHERE l.user_id = %s AND l.date = %s
-    """, (user_id, date))
+        cursor = conn.cursor(dictionary=True)
 
-    rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
+        cursor.execute(_DAY_LOG_SQL, (user_id, date))
+
+        rows = cursor.fetchall()
+        cursor.close()
 
     return rows
 
 def get_day_totals(user_id, date):
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("""
-        SELECT 
-            SUM(f.calories * l.quantity) AS calories,
-            SUM(f.protein * l.quantity) AS protein,
-            SUM(f.carbs * l.quantity) AS carbs,
-            SUM(f.fat * l.quantity) AS fat
-        FROM food_logs l
-        JOIN food_items f ON l.food_id = f.food_id
-        WHERE l.user_id = %s AND l.date = %s
-    """, (user_id, date))
-
-    totals = cursor.fetchone()
-    cursor.close()
-    conn.close()
-
-    return totals
+    """
+    Calories and macros for a day, read from daily_nutrition_summary
+    """
+    with get_connection() as conn:
+        if not conn:
+            return {"calories": None, "protein": None, "carbs": None, "fat": None}
+
+        cursor = conn.cursor(dictionary=True)
+
+        cursor.execute(_DAY_TOTALS_SQL, (user_id, date))
+
+        totals = cursor.fetchone()
+        cursor.close()
+
+    # Same shape as SUM() over no rows
+    return totals or {"calories": None, "protein": None, "carbs": None, "fat": None}
@@ -1,88 +1,176 @@
-import requests
-import json
-from backend.db.connection import create_connection
+from mysql.connector import Error
+from backend.db.connection import get_connection
+from backend.cache.food_cache import get_food_cache
+from backend.cache.food_index import FoodIndex
+from backend.cache.memory_cache import LRUCache, normalize_query
+from backend.services.usda_client import get_usda_client
+from backend.services.nutrients import iter_foods
+from backend.services.nutrition_summary import refresh_day_summary
+from backend.services.food_log_service import (
+    DAY_FOOD_LOGS_SQL, LOG_DELETE_SQL, LOG_INSERT_SQL, LOG_UPDATE_SQL, food_logs_changed
+)
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
-API_KEY = os.getenv("USDA_API_KEY")  # store in .env ideally
-API_URL = "https://api.nal.usda.gov/fdc/v1/foods/search"
+# In-memory memo in front of the disk cache and the USDA API
+_search_memo = LRUCache(
+    max_entries=int(os.getenv("SEARCH_MEMO_MAX_ENTRIES", "512")),
+    max_bytes=int(os.getenv("SEARCH_MEMO_MAX_BYTES", str(4 * 1024 * 1024))),
+    ttl=float(os.getenv("SEARCH_MEMO_TTL", "3600"))
+)
 
 def search_food(query):
-    """Search USDA API or cached JSON for food items"""
-    try:
-        with open("data/cached_foods.json", "r") as f:
-            cached = json.load(f)
-    except FileNotFoundError:
-        cached = {}
-
-    if query.lower() in cached:
-        return cached[query.lower()]
-
-    params = {
-        "api_key": API_KEY,
-        "query": query,
-        "pageSize": 10
-    }
+    """Search USDA API or the local food cache for food items"""
+    key = normalize_query(query)
+    foods = _search_memo.get(key)
+    if foods is not None:
+        return foods
+
+    cache = get_food_cache()
+    foods = cache.get(key)
+    if foods is None:
+        foods = _fetch_usda(query.strip())
+        cache.put(key, foods)
+        _food_index.add_many(foods)
+
+    _search_memo.put(key, foods)
+    return foods
 
-    resp = requests.get(API_URL, params=params)
-    resp.raise_for_status()
-    results = resp.json().get("foods", [])
-
-    foods = []
-    for item in results:
-        foods.append({
-            "food_id": str(item["fdcId"]),
-            "name": item.get("description", "Unknown"),
-            "calories": next((n["value"] for n in item.get("foodNutrients", []) if n["nutrientName"]=="Energy"), 0),
-            "protein": next((n["value"] for n in item.get("foodNutrients", []) if n["nutrientName"]=="Protein"), 0),
-            "carbs": next((n["value"] for n in item.get("foodNutrients", []) if n["nutrientName"]=="Carbohydrate, by difference"), 0),
-            "fat": next((n["value"] for n in item.get("foodNutrients", []) if n["nutrientName"]=="Total lipid (fat)"), 0)
-        })
-
-    cached[query.lower()] = foods
-    with open("data/cached_foods.json", "w") as f:
-        json.dump(cached, f, indent=2)
 
-    return foods
+# Background workers for search_food_async (created on first use)
+SEARCH_WORKERS = 4
+_search_executor = None
+_search_executor_lock = threading.Lock()
+
+def search_food_async(query):
+    """
+    Run search_food on a background thread and return a concurrent.futures.Future.
+    Futures that have not started yet can be cancelled with future.cancel().
+    """
+    global _search_executor
+    if _search_executor is None:
+        with _search_executor_lock:
+            if _search_executor is None:
+                _search_executor = ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix="food-search")
+    return _search_executor.submit(search_food, query)
+
+
+# Local index over cached searches + food_items, built in the background
+FOOD_INDEX_MAX_ITEMS = int(os.getenv("FOOD_INDEX_MAX_ITEMS", "50000"))
+_food_index = FoodIndex()
+_food_index_thread = None
+_food_index_lock = threading.Lock()
+
+def get_food_index():
+    """Return the shared local index, starting its background build on first use"""
+    global _food_index_thread
+    if _food_index_thread is None:
+        with _food_index_lock:
+            if _food_index_thread is None:
+                _food_index_thread = threading.Thread(target=_build_food_index, name="food-index", daemon=True)
+                _food_index_thread.start()
+    return _food_index
+
+
+def local_search_food(query, limit=10):
+    """
+    Instant suggestions from foods already on this machine (no network).
+    Returns fewer results while the index is still loading.
+    """
+    return get_food_index().search(query, limit)
+
+
+def _build_food_index():
+    _food_index.add_many(get_food_cache().iter_foods())
+    try:
+        with get_connection() as conn:
+            if not conn:
+                return
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                "SELECT food_id, name, calories, protein, carbs, fat FROM food_items LIMIT %s",
+                (FOOD_INDEX_MAX_ITEMS,)
+            )
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                _food_index.add_many(rows)
+            cursor.close()
+    except Error as e:
+        print(f"Food index: could not load food_items: {e}")
+
+
+def search_cache_stats():
+    """Hit/miss/eviction counters for the in-memory search memo"""
+    return _search_memo.stats()
+
+
+def prewarm_search_cache(queries):
+    """
+    Resolve many searches concurrently and store them in the caches.
+    Returns {query: error} for the queries that failed.
+    """
+    cache = get_food_cache()
+    keys = {}  # the first query text seen for each uncached key
+    for query in queries:
+        key = normalize_query(query)
+        if key not in cache and key not in keys:
+            keys[key] = query.strip()
+    texts = {text: key for key, text in keys.items()}
+    errors = {}
+    for text, results in get_usda_client().search_many(list(texts)).items():
+        key = texts[text]
+        if isinstance(results, Exception):
+            errors[key] = results
+            continue
+        foods = list(iter_foods(results))
+        cache.put(key, foods)
+        _food_index.add_many(foods)
+        _search_memo.put(key, foods)
+    return errors
+
+
+def _fetch_usda(query):
+    return list(iter_foods(get_usda_client().search(query)))
 
 
 def log_food(user_id, food_id, meal_type, quantity, log_date=None):
+    """
+    Log quantity of a food for a meal. If the food is already in that meal on
+    that day, quantity is added to it; use update_food_log_quantity to set
+    it. Returns False if the database is unreachable.
+    """
     log_date = log_date or date.today()
-    conn = create_connection()
-    cursor = conn.cursor()
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        INSERT INTO food_logs (user_id, food_id, date, meal_type, quantity)
-        VALUES (%s, %s, %s, %s, %s)
-        ON DUPLICATE KEY UPDATE quantity = VALUES(quantity)
-    """, (user_id, food_id, log_date, meal_type, quantity))
+        cursor.execute(LOG_INSERT_SQL, (user_id, food_id, log_date, meal_type, quantity))
+        refresh_day_summary(cursor, user_id, log_date)
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+        conn.commit()
+        cursor.close()
+    food_logs_changed(user_id, log_date)
+    return True
 
 
 def get_daily_food_logs(user_id, log_date=None):
     log_date = log_date or date.today()
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("""
-        SELECT fl.log_id, fl.food_id, fl.date, f.name, fl.meal_type, fl.quantity,
-            f.calories * fl.quantity AS total_calories,
-            f.protein * fl.quantity AS total_protein,
-            f.carbs * fl.quantity AS total_carbs,
-            f.fat * fl.quantity AS total_fat
-        FROM food_logs fl
-        JOIN food_items f ON fl.food_id = f.food_id
-        WHERE fl.user_id = %s AND fl.date = %s
-        ORDER BY fl.meal_type
-    """, (user_id, log_date))
-
-
-    logs = cursor.fetchall()
-    cursor.close()
-    conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return [], {"calories": 0, "protein": 0, "carbs": 0, "fat": 0}
+
+        cursor = conn.cursor(dictionary=True)
+
+        cursor.execute(DAY_FOOD_LOGS_SQL, (user_id, log_date))
+
+        logs = cursor.fetchall()
+        cursor.close()
 
     totals = {
         "calories": sum(l['total_calories'] for l in logs),
@@ -95,29 +183,34 @@ def get_daily_food_logs(user_id, log_date=None):
 
 def update_food_log_quantity(user_id, food_id, log_date, meal_type, quantity):
     """
-    Update the quantity of a food log entry for a specific user, meal, and date
+    Update the quantity of a food log entry for a specific user, meal, and date.
+    Returns False if the database is unreachable.
     """
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE food_logs
-        SET quantity = %s
-        WHERE user_id = %s AND food_id = %s AND date = %s AND meal_type = %s
-    """, (quantity, user_id, food_id, log_date, meal_type))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        cursor.execute(LOG_UPDATE_SQL, (quantity, user_id, food_id, log_date, meal_type))
+        refresh_day_summary(cursor, user_id, log_date)
+        conn.commit()
+        cursor.close()
+    food_logs_changed(user_id, log_date)
+    return True
 
 def delete_food_log_entry(user_id, food_id, log_date, meal_type):
     """
-    Delete a food log entry for a specific user, meal, and date
+    Delete a food log entry for a specific user, meal, and date.
+    Returns False if the database is unreachable.
     """
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        DELETE FROM food_logs
-        WHERE user_id = %s AND food_id = %s AND date = %s AND meal_type = %s
-    """, (user_id, food_id, log_date, meal_type))
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        cursor.execute(LOG_DELETE_SQL, (user_id, food_id, log_date, meal_type))
+        refresh_day_summary(cursor, user_id, log_date)
+        conn.commit()
+        cursor.close()
+    food_logs_changed(user_id, log_date)
+    return True
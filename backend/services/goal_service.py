@@ -0,0 +1,49 @@
+# Activity multipliers based on Harris-Benedict Equation
+ACTIVITY_LEVELS = {
+    "Sedentary (little/no exercise)": 1.2,
+    "Lightly Active (light exercise 1-3 days/week)": 1.375,
+    "Moderately Active (moderate exercise 3-5 days/week)": 1.55,
+    "Very Active (hard exercise 6-7 days/week)": 1.725,
+    "Extra Active (very hard exercise & physical job)": 1.9
+}
+
+# Weight loss goals in lbs/week
+WEIGHT_LOSS_GOALS = {
+    "Maintain Weight": 0,
+    "1 lb/week": 1,
+    "2 lbs/week": 2
+}
+
+DEFAULT_ACTIVITY_LEVEL = next(iter(ACTIVITY_LEVELS))
+DEFAULT_WEIGHT_GOAL = next(iter(WEIGHT_LOSS_GOALS))
+FALLBACK_TARGET = 2000  # kcal, used when the profile is incomplete
+
+
+def calculate_daily_target(profile, activity_level=DEFAULT_ACTIVITY_LEVEL, weight_goal=DEFAULT_WEIGHT_GOAL):
+    """
+    Compute BMR from a user row (weight_kg, height_cm, age, gender) and adjust
+    for activity + weight loss goal. Returns calories per day as an int.
+    """
+    if not profile or any(profile.get(k) is None for k in ("weight_kg", "height_cm", "age", "gender")):
+        return FALLBACK_TARGET
+
+    weight_kg = float(profile['weight_kg'])
+    height_cm = float(profile['height_cm'])
+    age = int(profile['age'])
+    gender = profile['gender']
+
+    # Harris-Benedict BMR
+    if gender.lower() == "male":
+        bmr = 88.36 + (13.4 * weight_kg) + (4.8 * height_cm) - (5.7 * age)
+    else:
+        bmr = 447.6 + (9.2 * weight_kg) + (3.1 * height_cm) - (4.3 * age)
+
+    # Activity multiplier
+    activity_multiplier = ACTIVITY_LEVELS.get(activity_level, 1.2)
+    maintenance_calories = bmr * activity_multiplier
+
+    # Adjust for weight loss goal
+    lbs_per_week = WEIGHT_LOSS_GOALS.get(weight_goal, 0)
+    # 1 lb fat ≈ 3500 kcal
+    daily_deficit = (lbs_per_week * 3500) / 7
+    return max(0, int(maintenance_calories - daily_deficit))
@@ -0,0 +1,155 @@
+# backend/services/nutrients.py
+import json
+
+# FoodData Central nutrient id -> (field, priority). Lower priority wins when
+# a food reports the same field more than once (e.g. several energy values).
+NUTRIENT_IDS = {
+    1008: ("calories", 0),      # Energy (KCAL)
+    2047: ("calories", 1),      # Energy (Atwater General Factors)
+    2048: ("calories", 2),      # Energy (Atwater Specific Factors)
+    1003: ("protein", 0),
+    1005: ("carbs", 0),         # Carbohydrate, by difference
+    1050: ("carbs", 1),         # Carbohydrate, by summation
+    1004: ("fat", 0),           # Total lipid (fat)
+    1085: ("fat", 1),           # Total fat (NLEA)
+    1079: ("fiber", 0),         # Fiber, total dietary
+    2000: ("sugar", 0),         # Sugars, total including NLEA
+    1063: ("sugar", 1),         # Sugars, Total
+    1093: ("sodium", 0),        # mg
+    1092: ("potassium", 0),     # mg
+    1087: ("calcium", 0),       # mg
+    1089: ("iron", 0),          # mg
+    1253: ("cholesterol", 0),   # mg
+    1258: ("saturated_fat", 0),
+    1257: ("trans_fat", 0),
+    1162: ("vitamin_c", 0),     # mg
+    1106: ("vitamin_a", 0),     # µg RAE
+    1114: ("vitamin_d", 0),     # µg
+}
+
+# Fallback for entries that only carry a name (older/abridged payloads)
+NUTRIENT_NAMES = {
+    "Energy": ("calories", 0),
+    "Protein": ("protein", 0),
+    "Carbohydrate, by difference": ("carbs", 0),
+    "Total lipid (fat)": ("fat", 0),
+    "Fiber, total dietary": ("fiber", 0),
+    "Sugars, total including NLEA": ("sugar", 0),
+    "Sodium, Na": ("sodium", 0),
+}
+
+MACROS = ("calories", "protein", "carbs", "fat")
+MICROS = tuple(dict.fromkeys(field for field, _ in NUTRIENT_IDS.values() if field not in MACROS))
+
+
+def extract_nutrients(food_nutrients):
+    """
+    One pass over a USDA `foodNutrients` list -> {field: value}.
+
+    Handles both the search/abridged shape ({"nutrientId", "nutrientName",
+    "unitName", "value"}) and the full food shape ({"nutrient": {...}, "amount"}).
+    """
+    values = {}
+    ranks = {}
+    for n in food_nutrients:
+        nutrient = n.get("nutrient")
+        if nutrient is not None:
+            nutrient_id, name, unit = nutrient.get("id"), nutrient.get("name"), nutrient.get("unitName")
+            value = n.get("amount")
+        else:
+            nutrient_id, name, unit = n.get("nutrientId"), n.get("nutrientName"), n.get("unitName")
+            value = n.get("value", n.get("amount"))
+        if value is None:
+            continue
+
+        entry = NUTRIENT_IDS.get(nutrient_id)
+        if entry is None:
+            entry = NUTRIENT_NAMES.get(name)
+            # Energy is also reported in kJ under the same name
+            if entry is None or (entry[0] == "calories" and unit and unit.upper() != "KCAL"):
+                continue
+
+        field, rank = entry
+        if field not in ranks or rank < ranks[field]:
+            values[field] = value
+            ranks[field] = rank
+    return values
+
+
+def food_from_usda(item):
+    """USDA food (search hit or full record) -> the app's food dict"""
+    nutrients = extract_nutrients(item.get("foodNutrients", ()))
+    food = {
+        "food_id": str(item["fdcId"]),
+        "name": item.get("description", "Unknown"),
+    }
+    for field in MACROS:
+        food[field] = nutrients.get(field, 0)
+    for field in MICROS:
+        food[field] = nutrients.get(field)
+    return food
+
+
+def iter_foods(items):
+    """Lazily convert an iterable of USDA foods (a page, or a streamed dump)"""
+    for item in items:
+        if "fdcId" in item:
+            yield food_from_usda(item)
+
+
+def iter_dump_foods(path, chunk_size=1 << 16):
+    """
+    Stream foods out of a FoodData Central JSON download (e.g.
+    {"SRLegacyFoods": [...]}) without loading the whole file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        yield from iter_foods(iter_json_array(f, chunk_size))
+
+
+def iter_json_array(fp, chunk_size=1 << 16):
+    """
+    Yield the elements of the first JSON array in a file one at a time.
+    Memory stays bounded by the largest single element.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    # Find the opening bracket of the first array
+    while True:
+        start = buf.find("[")
+        if start != -1:
+            buf = buf[start + 1:]
+            break
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            return
+        buf = chunk
+
+    pos = 0
+    while True:
+        # Skip separators
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf):
+                break
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                return
+            buf, pos = chunk, 0
+
+        if buf[pos] == "]":
+            return
+
+        try:
+            element, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            chunk = fp.read(chunk_size)
+            if not chunk:
+                raise
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+
+        yield element
+        pos = end
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
@@ -0,0 +1,151 @@
+# backend/services/nutrition_summary.py
+"""
+daily_nutrition_summary: one row of calorie/macro totals per (user_id, date).
+
+The food log writers call refresh_day_summary() on the same cursor, inside
+the same transaction, so the rollup never disagrees with food_logs. Each
+refresh re-sums just that user's day (a handful of rows) rather than
+applying +/- deltas, so upserts and edits cannot drift the totals.
+
+Views that span many days (calendar, trends) read this table instead of
+aggregating food_logs JOIN food_items.
+
+Backfill, or repair after food_items nutrient values changed (e.g. a new
+FDC import):
+
+    python -m backend.services.nutrition_summary --rebuild [--user USER_ID]
+"""
+import argparse
+import sys
+from mysql.connector import Error
+from backend.db.connection import get_connection
+
+_SUMMARY_SELECT = """
+    SELECT l.user_id, l.date,
+           COALESCE(SUM(f.calories * l.quantity), 0),
+           COALESCE(SUM(f.protein * l.quantity), 0),
+           COALESCE(SUM(f.carbs * l.quantity), 0),
+           COALESCE(SUM(f.fat * l.quantity), 0),
+           COUNT(*)
+    FROM food_logs l
+    JOIN food_items f ON l.food_id = f.food_id
+"""
+
+_SUMMARY_INSERT = """
+    INSERT INTO daily_nutrition_summary (user_id, date, calories, protein, carbs, fat, entry_count)
+""" + _SUMMARY_SELECT
+
+_DAY_SUMMARY_SQL = """
+    SELECT calories, protein, carbs, fat, entry_count
+    FROM daily_nutrition_summary
+    WHERE user_id = %s AND date = %s
+"""
+
+_SUMMARIES_BETWEEN_SQL = """
+    SELECT date, calories, protein, carbs, fat, entry_count
+    FROM daily_nutrition_summary
+    WHERE user_id = %s AND date BETWEEN %s AND %s
+    ORDER BY date
+"""
+
+
+# ----------------- Maintenance (call inside the writer's transaction) -----------------
+def refresh_day_summary(cursor, user_id, log_date):
+    """Recompute one day's summary row from food_logs (no row if the day is empty)"""
+    cursor.execute(
+        "DELETE FROM daily_nutrition_summary WHERE user_id = %s AND date = %s",
+        (user_id, log_date)
+    )
+    cursor.execute(
+        _SUMMARY_INSERT + " WHERE l.user_id = %s AND l.date = %s GROUP BY l.user_id, l.date",
+        (user_id, log_date)
+    )
+
+
+def refresh_day_summaries(cursor, days):
+    """refresh_day_summary for each distinct (user_id, date) in days"""
+    for user_id, log_date in sorted(set(days)):
+        refresh_day_summary(cursor, user_id, log_date)
+
+
+# ----------------- Reads -----------------
+def get_day_summary(user_id, log_date):
+    """Totals for one day as {calories, protein, carbs, fat, entry_count}, or None"""
+    with get_connection() as conn:
+        if not conn:
+            return None
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(_DAY_SUMMARY_SQL, (user_id, log_date))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+
+def get_summaries_between(user_id, start_date, end_date):
+    """
+    {date: {calories, protein, carbs, fat, entry_count}} for the days in
+    [start_date, end_date] that have any food logged
+    """
+    with get_connection() as conn:
+        if not conn:
+            return {}
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(_SUMMARIES_BETWEEN_SQL, (user_id, start_date, end_date))
+            return {row.pop('date'): row for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+
+
+# ----------------- Rebuild -----------------
+def rebuild_summaries(user_id=None):
+    """
+    Recompute daily_nutrition_summary from food_logs for one user (or
+    everyone) in a single transaction. Returns the number of summary rows.
+    """
+    if user_id is not None:
+        where, log_where, params = " WHERE user_id = %s", " WHERE l.user_id = %s", (user_id,)
+    else:
+        where, log_where, params = "", "", ()
+
+    with get_connection() as conn:
+        if not conn:
+            raise SystemExit("Could not connect to MySQL")
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute("DELETE FROM daily_nutrition_summary" + where, params)
+            cursor.execute(_SUMMARY_INSERT + log_where + " GROUP BY l.user_id, l.date", params)
+            rows = cursor.rowcount
+            conn.commit()
+            return rows
+        except Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the daily_nutrition_summary rollup")
+    parser.add_argument("--rebuild", action="store_true", help="recompute summaries from food_logs")
+    parser.add_argument("--user", type=int, help="only this user_id")
+    args = parser.parse_args(argv)
+
+    if not args.rebuild:
+        parser.print_help()
+        return 0
+    try:
+        rows = rebuild_summaries(args.user)
+    except Error as e:
+        print(f"Rebuild failed: {e}")
+        return 1
+    print(f"Rebuilt {rows} daily summary rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from backend.db.connection import get_connection
+from backend.cache.day_cache import get_day_cache
+from backend.services.food_log_service import DAY_FOOD_LOGS_SQL
+from backend.services.goal_service import calculate_daily_target, DEFAULT_ACTIVITY_LEVEL, DEFAULT_WEIGHT_GOAL
+from backend.services.weight_series import WeightSeries, DEFAULT_HEIGHT_M
+from backend.services.weight_service import select_weight_logs, WEIGHT_PAGE_SIZE
+
+_PROFILE_SQL = """
+    SELECT user_id, username, height_cm, weight_kg, age, gender
+    FROM users
+    WHERE user_id = %s
+"""
+
+
+def get_user_profile(user_id):
+    """
+    Fetch the fields the dashboard needs from users (no password hash), or
+    None if the database is unreachable
+    """
+    with get_connection() as conn:
+        if not conn:
+            return None
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(_PROFILE_SQL, (user_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+
+def height_m_from_profile(profile):
+    if profile and profile.get('height_cm'):
+        return float(profile['height_cm']) / 100
+    return DEFAULT_HEIGHT_M
+
+
+def get_day_snapshot(user_id, log_date=None, activity_level=DEFAULT_ACTIVITY_LEVEL, weight_goal=DEFAULT_WEIGHT_GOAL):
+    """
+    Everything the dashboard renders for one day, read over a single pooled
+    connection:
+
+        {
+            "date": date,
+            "user": {...profile...},
+            "food_logs": [...],     # same rows as get_daily_food_logs
+            "totals": {...},        # calories/protein/carbs/fat
+            "weight_logs": [...],   # newest WEIGHT_PAGE_SIZE weight_logs rows, oldest first
+            "weight_series": WeightSeries,
+            "height_m": float,
+            "target": int,          # daily calorie target
+        }
+
+    Returns None if the database is unreachable.
+    """
+    log_date = log_date or date.today()
+
+    with get_connection() as conn:
+        if not conn:
+            return None
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(_PROFILE_SQL, (user_id,))
+            profile = cursor.fetchone()
+
+            cursor.execute(DAY_FOOD_LOGS_SQL, (user_id, log_date))
+            food_logs = cursor.fetchall()
+
+            weight_logs = select_weight_logs(cursor, user_id, limit=WEIGHT_PAGE_SIZE, newest_first=True)
+        finally:
+            cursor.close()
+
+    totals = {
+        "calories": sum(l['total_calories'] for l in food_logs),
+        "protein": sum(l['total_protein'] for l in food_logs),
+        "carbs": sum(l['total_carbs'] for l in food_logs),
+        "fat": sum(l['total_fat'] for l in food_logs)
+    }
+
+    height_m = height_m_from_profile(profile)
+
+    return {
+        "date": log_date,
+        "user": profile,
+        "food_logs": food_logs,
+        "totals": totals,
+        "weight_logs": weight_logs,
+        "weight_series": WeightSeries.from_rows(weight_logs, height_m),
+        "height_m": height_m,
+        "target": calculate_daily_target(profile, activity_level, weight_goal),
+    }
+
+
+def empty_snapshot(log_date):
+    """A get_day_snapshot-shaped day with nothing logged (used while the database is unreachable)"""
+    return {
+        "date": log_date,
+        "user": None,
+        "food_logs": [],
+        "totals": {"calories": 0, "protein": 0, "carbs": 0, "fat": 0},
+        "weight_logs": [],
+        "weight_series": WeightSeries.from_rows([]),
+        "height_m": DEFAULT_HEIGHT_M,
+        "target": calculate_daily_target(None),
+    }
+
+
+# ----------------- Cached snapshots -----------------
+_prefetch_executor = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def get_cached_day_snapshot(user_id, log_date=None, activity_level=DEFAULT_ACTIVITY_LEVEL,
+                            weight_goal=DEFAULT_WEIGHT_GOAL, prefetch=True):
+    """
+    get_day_snapshot through the per-user day cache (invalidated by the log
+    writers). The calorie target is recomputed from the cached profile, so
+    changing activity level or goal needs no re-read. Unless prefetch is
+    False, the day before and after are loaded in the background. While the
+    database is unreachable an empty snapshot is returned.
+    """
+    log_date = log_date or date.today()
+    snapshot = get_day_cache().get_or_load(user_id, log_date, lambda: get_day_snapshot(user_id, log_date))
+    if snapshot is None:
+        snapshot = empty_snapshot(log_date)  # database unreachable; not cached
+    if prefetch:
+        prefetch_neighbour_days(user_id, log_date)
+    return dict(snapshot, target=calculate_daily_target(snapshot["user"], activity_level, weight_goal))
+
+
+def prefetch_neighbour_days(user_id, log_date):
+    """Warm the day cache for yesterday/tomorrow of log_date (never future days)"""
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _prefetch_executor_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="day-prefetch")
+
+    cache = get_day_cache()
+    for day in (log_date - timedelta(days=1), log_date + timedelta(days=1)):
+        if day <= date.today() and (user_id, day) not in cache:
+            _prefetch_executor.submit(cache.load, user_id, day, lambda d=day: get_day_snapshot(user_id, d))
@@ -0,0 +1,155 @@
+# backend/services/usda_client.py
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_KEY = os.getenv("USDA_API_KEY")  # store in .env ideally
+API_BASE = os.getenv("USDA_API_BASE", "https://api.nal.usda.gov/fdc/v1")  # point at a stub server for tests
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+FOODS_PER_REQUEST = 20  # POST /foods accepts at most 20 fdcIds
+
+
+class RateLimitError(requests.HTTPError):
+    """USDA said to slow down for longer than we are willing to wait"""
+
+
+class USDAClient:
+    """
+    FoodData Central client on a persistent keep-alive session.
+
+    Every request has a (connect, read) timeout. Connection errors, 5xx and
+    429 responses are retried with exponential backoff and jitter; a 429's
+    Retry-After is honoured up to max_wait seconds. The last seen
+    X-RateLimit-Remaining is kept in rate_limit_remaining.
+    """
+
+    def __init__(self, api_key=API_KEY, base_url=API_BASE, timeout=(3.05, 10), max_retries=3,
+                 backoff=0.5, max_wait=30, max_workers=4, session=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_wait = max_wait
+        self.max_workers = max_workers
+        self.rate_limit_remaining = None
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+        self._blocked_until = 0.0  # shared back-off after a 429
+        self._lock = threading.Lock()
+
+    # ----------------- Single requests -----------------
+    def search(self, query, page_size=10):
+        """Raw `foods` list from /foods/search"""
+        data = self._request("GET", "/foods/search", params={"query": query, "pageSize": page_size})
+        return data.get("foods", [])
+
+    def get_food(self, fdc_id):
+        return self._request("GET", f"/food/{fdc_id}")
+
+    # ----------------- Batch requests -----------------
+    def search_many(self, queries, page_size=10):
+        """
+        Run several searches concurrently. Returns {query: foods}; a query
+        that failed maps to its exception instead.
+        """
+        queries = list(dict.fromkeys(queries))
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="usda") as pool:
+            futures = {q: pool.submit(self.search, q, page_size) for q in queries}
+        return {q: _result_or_error(f) for q, f in futures.items()}
+
+    def get_foods(self, fdc_ids):
+        """Fetch many foods by fdcId, 20 per POST /foods, chunks in parallel"""
+        fdc_ids = [int(i) for i in dict.fromkeys(fdc_ids)]
+        chunks = [fdc_ids[i:i + FOODS_PER_REQUEST] for i in range(0, len(fdc_ids), FOODS_PER_REQUEST)]
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="usda") as pool:
+            pages = pool.map(lambda chunk: self._request("POST", "/foods", json={"fdcIds": chunk}), chunks)
+            return [food for page in pages for food in page]
+
+    def close(self):
+        self.session.close()
+
+    # ----------------- Internals -----------------
+    def _request(self, method, path, params=None, json=None):
+        params = dict(params or {}, api_key=self.api_key)
+        url = self.base_url + path
+
+        for attempt in range(self.max_retries + 1):
+            self._wait_if_blocked()
+            try:
+                resp = self.session.request(method, url, params=params, json=json, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            remaining = resp.headers.get("X-RateLimit-Remaining")
+            if remaining is not None and remaining.isdigit():
+                self.rate_limit_remaining = int(remaining)
+
+            if resp.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                if resp.status_code == 429:
+                    raise RateLimitError("USDA rate limit exceeded", response=resp)
+                resp.raise_for_status()
+                return resp.json()
+
+            delay = self._backoff_delay(attempt)
+            if resp.status_code == 429:
+                retry_after = _retry_after_seconds(resp)
+                if retry_after is not None:
+                    if retry_after > self.max_wait:
+                        raise RateLimitError(f"USDA rate limit: retry after {retry_after:.0f}s", response=resp)
+                    delay = max(delay, retry_after)
+                with self._lock:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            time.sleep(delay)
+
+    def _backoff_delay(self, attempt):
+        return self.backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+
+    def _wait_if_blocked(self):
+        delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _retry_after_seconds(resp):
+    value = resp.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _result_or_error(future):
+    try:
+        return future.result()
+    except Exception as e:
+        return e
+
+
+# ----------------- Shared client -----------------
+_client = None
+_client_lock = threading.Lock()
+
+def get_usda_client():
+    """Return the process-wide client (one keep-alive session)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = USDAClient()
+    return _client
@@ -0,0 +1,125 @@
+# backend/services/weight_series.py
+import numpy as np
+
+KG_PER_LB = 0.453592
+DEFAULT_HEIGHT_M = 1.75  # fallback if the user has no height set
+
+# Lower bound of each BMI category
+BMI_CATEGORIES = [
+    (0, "Underweight"),
+    (18.5, "Normal"),
+    (25, "Overweight"),
+    (30, "Obese")
+]
+_BMI_BOUNDS = np.array([lower for lower, _ in BMI_CATEGORIES[1:]])
+_BMI_LABELS = np.array([label for _, label in BMI_CATEGORIES])
+
+
+def bmi_category(bmi):
+    """Category label(s) for a BMI value or array of values"""
+    return _BMI_LABELS[np.searchsorted(_BMI_BOUNDS, bmi, side="right")]
+
+
+class WeightSeries:
+    """
+    A user's weight history as parallel NumPy columns, computed once per fetch:
+
+        log_ids, dates (datetime64[D]), kg, lb, bmi, bmi_category
+
+    Rows are in ascending date order (as the weight_logs queries return them).
+    """
+
+    def __init__(self, log_ids, dates, weights_kg, height_m=DEFAULT_HEIGHT_M):
+        self.height_m = height_m or DEFAULT_HEIGHT_M
+        self.log_ids = np.asarray(log_ids, dtype=np.int64)
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.kg = np.asarray(weights_kg, dtype=float)
+        self.lb = self.kg / KG_PER_LB
+        self.bmi = self.kg / self.height_m ** 2
+        self.bmi_category = bmi_category(self.bmi)
+
+    @classmethod
+    def from_rows(cls, rows, height_m=DEFAULT_HEIGHT_M):
+        """Build from weight_logs rows ({log_id, date, weight_kg})"""
+        return cls(
+            [row.get('log_id', 0) for row in rows],
+            [row['date'] for row in rows],
+            [row['weight_kg'] for row in rows],
+            height_m
+        )
+
+    def __len__(self):
+        return len(self.kg)
+
+    def latest(self):
+        """Most recent entry as a dict, or None if there are no logs"""
+        if not len(self):
+            return None
+        return self.row(len(self) - 1)
+
+    def row(self, i):
+        return {
+            'log_id': int(self.log_ids[i]),
+            'date': self.dates[i].item(),
+            'weight_kg': float(self.kg[i]),
+            'weight_lb': float(self.lb[i]),
+            'bmi': float(self.bmi[i]),
+            'bmi_category': str(self.bmi_category[i]),
+        }
+
+    def rows(self):
+        """Row dicts (for list widgets), converted in one pass"""
+        keys = ('log_id', 'date', 'weight_kg', 'weight_lb', 'bmi', 'bmi_category')
+        columns = zip(
+            self.log_ids.tolist(),
+            self.dates.tolist(),
+            self.kg.tolist(),
+            self.lb.tolist(),
+            self.bmi.tolist(),
+            self.bmi_category.tolist()
+        )
+        return [dict(zip(keys, values)) for values in columns]
+
+    def between(self, start, end):
+        """Entries with start <= date <= end, as a new series"""
+        lo = np.searchsorted(self.dates, np.datetime64(start, "D"), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(end, "D"), side="right")
+        return WeightSeries(self.log_ids[lo:hi], self.dates[lo:hi], self.kg[lo:hi], self.height_m)
+
+    def prepend(self, older):
+        """New series with an older page of entries placed in front of this one"""
+        return WeightSeries(
+            np.concatenate((older.log_ids, self.log_ids)),
+            np.concatenate((older.dates, self.dates)),
+            np.concatenate((older.kg, self.kg)),
+            self.height_m
+        )
+
+    # ----------------- Trends -----------------
+    def moving_average(self, column="lb", window_days=7):
+        """
+        Trailing moving average over the last window_days calendar days
+        (not the last N entries, so gaps in logging are handled).
+        """
+        values = getattr(self, column)
+        days = self.dates.astype(np.int64)
+        starts = np.searchsorted(days, days - window_days + 1, side="left")
+        sums = np.concatenate(([0.0], np.cumsum(values)))
+        ends = np.arange(1, len(values) + 1)
+        return (sums[ends] - sums[starts]) / (ends - starts)
+
+    def trend_slope(self, column="lb", window_days=None):
+        """
+        Least-squares slope in units per week, over the last window_days
+        days (or the whole history). None if fewer than two days of data.
+        """
+        values = getattr(self, column)
+        days = self.dates.astype(np.int64).astype(float)
+        if window_days is not None and len(days):
+            keep = days >= days[-1] - window_days + 1
+            days, values = days[keep], values[keep]
+        if len(days) < 2 or days[0] == days[-1]:
+            return None
+        centered = days - days.mean()
+        slope_per_day = np.dot(centered, values - values.mean()) / np.dot(centered, centered)
+        return float(slope_per_day * 7)
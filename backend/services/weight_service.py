@@ -1,4 +1,28 @@
-from backend.db.connection import create_connection
+from backend.db.connection import get_connection
+from backend.services.weight_series import WeightSeries, DEFAULT_HEIGHT_M
+from backend.services.calendar_service import invalidate_month
+from backend.cache.day_cache import get_day_cache
+
+WEIGHT_PAGE_SIZE = 180  # entries per page for the weight screen and dashboard
+
+_WEIGHT_LOGS_SQL = """
+    SELECT log_id, date, weight_kg
+    FROM weight_logs
+    WHERE user_id = %s
+    ORDER BY date
+"""
+_WEIGHT_HISTORY_SQL = "SELECT log_id, weight_kg, date FROM weight_logs WHERE user_id = %s ORDER BY date ASC"
+_WEIGHT_OWNER_SQL = "SELECT user_id, date FROM weight_logs WHERE log_id = %s"
+_WEIGHT_UPDATE_SQL = """
+    UPDATE weight_logs
+    SET weight_kg = %s
+    WHERE log_id = %s
+"""
+_WEIGHT_DELETE_SQL = """
+    DELETE FROM weight_logs
+    WHERE log_id = %s
+"""
+_HEIGHT_SQL = "SELECT height_cm FROM users WHERE user_id = %s"
 
 def get_user_id(user):
     if isinstance(user, dict):
@@ -7,114 +31,213 @@ def get_user_id(user):
 
 def log_weight(user_id: int, log_date, weight_kg: float):
     """
-    Insert a new weight log.
+    Insert a new weight log. Returns False if the database is unreachable.
     """
-    conn = create_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("""
-            INSERT INTO weight_logs (user_id, date, weight_kg)
-            VALUES (%s, %s, %s)
-            ON DUPLICATE KEY UPDATE weight_kg = VALUES(weight_kg)
-        """, (user_id, log_date, weight_kg))
-        conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            write_weight(cursor, user_id, log_date, weight_kg)
+            conn.commit()
+        finally:
+            cursor.close()
+    weight_logs_changed(user_id, log_date)
+    return True
+
+
+def write_weight(cursor, user_id, log_date, weight_kg):
+    """The upsert behind log_weight, on the caller's cursor and transaction"""
+    cursor.execute("""
+        INSERT INTO weight_logs (user_id, date, weight_kg)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE weight_kg = VALUES(weight_kg)
+    """, (user_id, log_date, weight_kg))
+
+
+def weight_logs_changed(user_id, log_date):
+    """Drop cached views after a weight log for log_date was committed"""
+    invalidate_month(user_id, log_date)
+    get_day_cache().invalidate_user(user_id)  # every day's snapshot shows the weight history
 
 
 def get_weight_logs_for_user(user_id: int):
     """
     Get all weight logs for a user, ordered by date.
     """
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        cursor.execute("""
-            SELECT log_id, date, weight_kg
-            FROM weight_logs
-            WHERE user_id = %s
-            ORDER BY date
-        """, (user_id,))
-        return cursor.fetchall()
-    finally:
-        cursor.close()
-        conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return []
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(_WEIGHT_LOGS_SQL, (user_id,))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
 
 
 def update_weight_log(log_id: int, weight_kg: float):
     """
-    Update an existing weight log's weight.
+    Update an existing weight log's weight. Returns False if the database is unreachable.
     """
-    conn = create_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("""
-            UPDATE weight_logs
-            SET weight_kg = %s
-            WHERE log_id = %s
-        """, (weight_kg, log_id))
-        conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute(_WEIGHT_OWNER_SQL, (log_id,))
+            row = cursor.fetchone()
+            cursor.execute(_WEIGHT_UPDATE_SQL, (weight_kg, log_id))
+            conn.commit()
+        finally:
+            cursor.close()
+    if row:
+        get_day_cache().invalidate_user(row[0])
+    return True
 
 
 def delete_weight_log(log_id: int):
     """
-    Delete a weight log by its log_id.
+    Delete a weight log by its log_id. Returns False if the database is unreachable.
     """
-    conn = create_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("""
-            DELETE FROM weight_logs
-            WHERE log_id = %s
-        """, (log_id,))
-        conn.commit()
-    finally:
-        cursor.close()
-        conn.close()
+    with get_connection() as conn:
+        if not conn:
+            return False
+
+        cursor = conn.cursor()
+        try:
+            # Find whose day this was for the calendar and day caches
+            cursor.execute(_WEIGHT_OWNER_SQL, (log_id,))
+            row = cursor.fetchone()
+            cursor.execute(_WEIGHT_DELETE_SQL, (log_id,))
+            conn.commit()
+        finally:
+            cursor.close()
+    if row:
+        weight_logs_changed(*row)
+    return True
 
 def get_weight_history(user):
     user_id = get_user_id(user)
 
-    conn = create_connection()
-    if not conn:
-        return []
+    with get_connection() as conn:
+        if not conn:
+            return []
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(_WEIGHT_HISTORY_SQL, (user_id,))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+
+# ----------------- Bounded reads -----------------
+# All of these are served by the (user_id, date) index on weight_logs, so
+# they cost O(rows returned) rather than O(history).
+
+def select_weight_logs(cursor, user_id, start_date=None, end_date=None,
+                       after=None, before=None, limit=None, newest_first=False):
+    """
+    Run a bounded weight_logs read on a dictionary cursor and return rows in
+    ascending date order.
+
+    start_date/end_date are inclusive; after/before are exclusive keyset
+    cursors. newest_first decides which end a limit keeps: False takes the
+    oldest `limit` matching rows (paging forward), True the newest (latest
+    page, or paging back from `before`).
+    """
+    sql = "SELECT log_id, date, weight_kg FROM weight_logs WHERE user_id = %s"
+    params = [user_id]
+    for column_sql, value in (("date >= %s", start_date), ("date <= %s", end_date),
+                              ("date > %s", after), ("date < %s", before)):
+        if value is not None:
+            sql += " AND " + column_sql
+            params.append(value)
+
+    sql += " ORDER BY date DESC" if newest_first else " ORDER BY date ASC"
+    if limit is not None:
+        sql += " LIMIT %s"
+        params.append(int(limit))
+
+    cursor.execute(sql, tuple(params))
+    rows = cursor.fetchall()
+    if newest_first:
+        rows.reverse()
+    return rows
+
+
+def _bounded_weight_logs(user_id, **bounds):
+    with get_connection() as conn:
+        if not conn:
+            return []
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            return select_weight_logs(cursor, user_id, **bounds)
+        finally:
+            cursor.close()
+
 
-    cursor = conn.cursor(dictionary=True)
-    try:
-        cursor.execute(
-            "SELECT log_id, weight_kg, date FROM weight_logs WHERE user_id = %s ORDER BY date ASC",
-            (user_id,)
-        )
-        return cursor.fetchall()
-    finally:
-        cursor.close()
-        conn.close()
+def get_latest_weight_logs(user_id, limit=1):
+    """The newest `limit` weight logs, oldest first"""
+    return _bounded_weight_logs(user_id, limit=limit, newest_first=True)
+
+
+def get_weight_logs_between(user_id, start_date, end_date):
+    """Weight logs with start_date <= date <= end_date"""
+    return _bounded_weight_logs(user_id, start_date=start_date, end_date=end_date)
+
+
+def get_weight_logs_after(user_id, after_date=None, limit=WEIGHT_PAGE_SIZE):
+    """
+    One page of weight logs dated after after_date (None = from the start).
+    Pass the last row's date as after_date to get the next page.
+    """
+    return _bounded_weight_logs(user_id, after=after_date, limit=limit)
+
+
+def get_weight_logs_before(user_id, before_date, limit=WEIGHT_PAGE_SIZE):
+    """The page of weight logs just before before_date (for loading older history)"""
+    return _bounded_weight_logs(user_id, before=before_date, limit=limit, newest_first=True)
+
+
+def get_weight_series(user_id, **bounds):
+    """
+    Fetch a user's weight logs and height over one connection and return
+    them as a WeightSeries (kg, lb, BMI and BMI category columns).
+
+    Takes the same bounds as select_weight_logs, e.g.
+    get_weight_series(user_id, limit=WEIGHT_PAGE_SIZE, newest_first=True) for
+    the latest page.
+    With no bounds it reads the whole history.
+    """
+    with get_connection() as conn:
+        if not conn:
+            return WeightSeries.from_rows([])
+
+        cursor = conn.cursor(dictionary=True)
+        try:
+            logs = select_weight_logs(cursor, user_id, **bounds)
+
+            cursor.execute(_HEIGHT_SQL, (user_id,))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+
+    height_m = float(row['height_cm']) / 100 if row and row['height_cm'] else DEFAULT_HEIGHT_M
+    return WeightSeries.from_rows(logs, height_m)
 
 
 def get_weight_history_with_bmi(user_id):
-    conn = create_connection()
-    cursor = conn.cursor(dictionary=True)  # dictionary cursor
-
-    # Get weight logs
-    cursor.execute(
-        "SELECT weight_kg, date FROM weight_logs WHERE user_id = %s ORDER BY date ASC",
-        (user_id,)
-    )
-    logs = cursor.fetchall()  # each row is a dict
-
-    # Get user height
-    cursor.execute("SELECT height_cm FROM users WHERE user_id = %s", (user_id,))
-    row = cursor.fetchone()  # dict because dictionary=True
-    height_m = row['height_cm'] if row and row['height_cm'] else 1.75  # fallback if not set
-
-    # Compute BMI for each log
-    for log in logs:
-        log['bmi'] = float(log['weight_kg']) / (height_m ** 2)
-
-    cursor.close()
-    conn.close()
-    return logs
+    """
+    Weight logs as dicts with date, weight_kg and bmi
+    """
+    series = get_weight_series(user_id)
+    return [
+        {'date': row['date'], 'weight_kg': row['weight_kg'], 'bmi': row['bmi']}
+        for row in series.rows()
+    ]
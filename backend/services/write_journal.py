@@ -0,0 +1,279 @@
+# backend/services/write_journal.py
+"""
+Write-behind journal for food and weight logging.
+
+The GUI appends each log to a local SQLite journal (WAL mode) and returns
+immediately; a background flusher applies journalled entries to MySQL in
+batches and deletes them once committed. If MySQL is unreachable the
+entries stay on disk (across restarts too) and the flusher retries with
+exponential backoff.
+
+Every entry carries an idempotency key. It is recorded in the MySQL
+applied_writes table in the same transaction as the write, so an entry that
+was committed but not yet removed from the journal (e.g. after a crash) is
+skipped rather than applied twice.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date
+from mysql.connector import Error, InterfaceError, OperationalError
+from backend.db.connection import get_connection
+from backend.services.food_log_service import write_food_entries, food_logs_changed
+from backend.services.weight_service import write_weight, weight_logs_changed
+
+JOURNAL_PATH = os.getenv("WRITE_JOURNAL_PATH", "data/write_journal.sqlite3")
+FLUSH_SECONDS = float(os.getenv("WRITE_JOURNAL_FLUSH_SECONDS", "2"))  # idle poll / base retry delay
+MAX_RETRY_SECONDS = 60
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 10  # entries MySQL rejects this many times are parked, not retried
+
+APPLIED_SQL = "INSERT IGNORE INTO applied_writes (idempotency_key) VALUES (%s)"
+
+
+class JournalOffline(Error):
+    """MySQL could not be reached; the batch stays journalled"""
+
+
+class WriteJournal:
+    """
+    Local journal of pending food/weight writes plus the thread that flushes
+    them to MySQL.
+
+        journal = get_write_journal()
+        journal.add_food_entry(user_id, food, "lunch", 1.5, log_date)
+        journal.status()  # {"pending": 1, "parked": 0, "online": True, ...}
+    """
+
+    def __init__(self, path=JOURNAL_PATH, flush_seconds=FLUSH_SECONDS, batch_size=BATCH_SIZE):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._status = {"applied": 0, "last_sync": None, "last_error": None, "online": True}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")  # an acknowledged log must survive a crash
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS journal (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT UNIQUE NOT NULL,
+                kind TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                log_date TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                retry_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                parked INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+    # ----------------- Enqueue -----------------
+    def add_food_entry(self, user_id, food, meal_type, quantity, log_date=None):
+        """Journal one food log (same arguments as log_food_entry); returns its key"""
+        payload = {"food": food, "meal_type": meal_type, "quantity": quantity}
+        return self._append("food", user_id, log_date or date.today(), payload)
+
+    def add_weight(self, user_id, log_date, weight_kg):
+        """Journal one weight log (same arguments as log_weight); returns its key"""
+        return self._append("weight", user_id, log_date, {"weight_kg": weight_kg})
+
+    def _append(self, kind, user_id, log_date, payload):
+        key = str(uuid.uuid4())
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO journal (key, kind, user_id, log_date, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, user_id, log_date.isoformat(), json.dumps(payload), time.time())
+            )
+        self.start()
+        self._wake.set()
+        return key
+
+    # ----------------- Queries -----------------
+    def pending(self, kind=None, user_id=None, log_date=None):
+        """Unapplied entries (oldest first) as dicts with key, kind, user_id, log_date and the payload fields"""
+        sql = "SELECT key, kind, user_id, log_date, payload, attempts, last_error, parked FROM journal WHERE 1=1"
+        params = []
+        for column, value in (("kind", kind), ("user_id", user_id),
+                              ("log_date", log_date.isoformat() if log_date else None)):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                params.append(value)
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY seq", params).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def status(self):
+        """Counts and flusher state for the dashboard's sync indicator"""
+        with self._lock:
+            pending, parked = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(parked), 0) FROM journal"
+            ).fetchone()
+            status = dict(self._status)
+        status["pending"] = pending - parked
+        status["parked"] = parked
+        return status
+
+    @staticmethod
+    def _entry(row):
+        key, kind, user_id, log_date, payload, attempts, last_error, parked = row
+        entry = json.loads(payload)
+        entry.update(key=key, kind=kind, user_id=user_id, log_date=date.fromisoformat(log_date),
+                     attempts=attempts, last_error=last_error, parked=bool(parked))
+        return entry
+
+    # ----------------- Flusher -----------------
+    def start(self):
+        """Start the background flusher (no-op if it is running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="write-journal", daemon=True)
+            self._thread.start()
+
+    def flush_now(self):
+        self._wake.set()
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                while self.flush_once():
+                    pass
+                failures = 0
+                delay = self.flush_seconds
+            except Exception as e:
+                # Offline (or the journal itself failed): keep everything and back off
+                failures += 1
+                delay = min(MAX_RETRY_SECONDS, self.flush_seconds * 2 ** failures)
+                with self._lock:
+                    self._status.update(online=False, last_error=str(e))
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def flush_once(self):
+        """
+        Apply one batch of due entries to MySQL. Returns how many entries were
+        processed (0 when nothing is due); raises if MySQL is unreachable.
+        """
+        with self._lock:
+            rows = self._db.execute("""
+                SELECT key, kind, user_id, log_date, payload, attempts, last_error, parked
+                FROM journal
+                WHERE parked = 0 AND retry_at <= ?
+                ORDER BY seq
+                LIMIT ?
+            """, (time.time(), self.batch_size)).fetchall()
+        entries = [self._entry(row) for row in rows]
+        if not entries:
+            return 0
+
+        with get_connection() as conn:
+            if not conn:
+                raise JournalOffline(msg="MySQL is unreachable")
+            try:
+                self._apply_all(conn, entries)
+                done, rejected = entries, []
+            except (InterfaceError, OperationalError):
+                raise
+            except Exception:
+                # Something in the batch was rejected: apply one at a time to isolate it
+                done, rejected = self._apply_each(conn, entries)
+
+        self._finish(done, rejected)
+        return len(entries)
+
+    def _apply_all(self, conn, entries):
+        cursor = conn.cursor()
+        try:
+            for entry in entries:
+                self._apply(cursor, entry)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _apply_each(self, conn, entries):
+        done, rejected = [], []
+        for entry in entries:
+            try:
+                self._apply_all(conn, [entry])
+                done.append(entry)
+            except (InterfaceError, OperationalError):
+                raise
+            except Exception as e:
+                rejected.append((entry, str(e)))
+        return done, rejected
+
+    @staticmethod
+    def _apply(cursor, entry):
+        cursor.execute(APPLIED_SQL, (entry["key"],))
+        if cursor.rowcount == 0:
+            return  # committed by an earlier flush that didn't get to clear the journal
+        if entry["kind"] == "food":
+            write_food_entries(cursor, entry["user_id"], [entry], entry["log_date"])
+        elif entry["kind"] == "weight":
+            write_weight(cursor, entry["user_id"], entry["log_date"], entry["weight_kg"])
+        else:
+            raise ValueError(f"Unknown journal entry kind {entry['kind']!r}")  # rejected, then parked
+
+    def _finish(self, done, rejected):
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.executemany("DELETE FROM journal WHERE key = ?", [(e["key"],) for e in done])
+            for entry, error in rejected:
+                attempts = entry["attempts"] + 1
+                self._db.execute(
+                    "UPDATE journal SET attempts = ?, retry_at = ?, last_error = ?, parked = ? WHERE key = ?",
+                    (attempts, now + min(MAX_RETRY_SECONDS, self.flush_seconds * 2 ** attempts),
+                     error, int(attempts >= MAX_ATTEMPTS), entry["key"])
+                )
+            self._db.execute("COMMIT")
+            self._status.update(
+                applied=self._status["applied"] + len(done),
+                last_sync=now,
+                online=True,
+                last_error=rejected[-1][1] if rejected else None
+            )
+
+        for kind, user_id, log_date in {(e["kind"], e["user_id"], e["log_date"]) for e in done}:
+            if kind == "food":
+                food_logs_changed(user_id, log_date)
+            else:
+                weight_logs_changed(user_id, log_date)
+
+
+# ----------------- Shared journal -----------------
+_journal = None
+_journal_lock = threading.Lock()
+
+def get_write_journal():
+    """Return the process-wide journal, opening it (and starting its flusher) on first use"""
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = WriteJournal()
+                _journal.start()
+    return _journal
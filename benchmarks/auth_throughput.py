@@ -0,0 +1,71 @@
+# benchmarks/auth_throughput.py
+"""
+Password-check throughput at different bcrypt work factors and pool sizes.
+
+    python -m benchmarks.auth_throughput
+    python -m benchmarks.auth_throughput --rounds 10 12 13 --workers 1 4 --logins 40 --json
+
+Only the hashing is measured (no MySQL): each login is one check_password
+against a hash of the given cost, submitted to a pool like the auth pool.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from backend.auth.auth import AUTH_WORKERS, hash_password, check_password
+
+
+def run(rounds, workers, logins):
+    password = "correct horse battery staple"
+    stored = hash_password(password, rounds)
+
+    latencies = []
+
+    def login():
+        started = time.perf_counter()
+        ok = check_password(password, stored)
+        latencies.append(time.perf_counter() - started)
+        return ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda _: login(), range(logins)))
+    elapsed = time.perf_counter() - started
+    assert all(results)
+
+    latencies.sort()
+    return {
+        "rounds": rounds,
+        "workers": workers,
+        "logins": logins,
+        "seconds": round(elapsed, 3),
+        "logins_per_sec": round(logins / elapsed, 2),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bcrypt login throughput")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12])
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, AUTH_WORKERS}))
+    parser.add_argument("--logins", type=int, default=20, help="logins per configuration")
+    parser.add_argument("--json", action="store_true", help="print JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    if not args.json:
+        print(f"{'rounds':>6} {'workers':>7} {'logins/s':>9} {'p50 ms':>8} {'max ms':>8}")
+    for rounds in args.rounds:
+        for workers in args.workers:
+            result = run(rounds, workers, args.logins)
+            if args.json:
+                print(json.dumps(result))
+            else:
+                print(f"{result['rounds']:>6} {result['workers']:>7} {result['logins_per_sec']:>9} "
+                      f"{result['p50_ms']:>8} {result['max_ms']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# benchmarks/dataset.py
+"""
+Synthetic data for the service benchmarks: users, food_items and years of
+food_logs / weight_logs, generated from a seed so every run measures the
+same database.
+
+The benchmark database is wiped before seeding, so it must not be the app's
+own database (BENCH_MYSQL_DB, default calorie_tracker_bench).
+"""
+import random
+from datetime import date, timedelta
+
+MEALS = ("breakfast", "lunch", "dinner", "snack")
+PASSWORD = "benchmark password"
+BATCH_SIZE = 5000
+
+_TABLES = ("applied_writes", "daily_nutrition_summary", "food_logs", "weight_logs", "users", "food_items")
+
+
+def username(index):
+    return f"bench_user_{index}"
+
+
+def generate(users=20, years=3, foods=500, seed=42, end=None):
+    """
+    {"food_items": [...], "users": [...], "food_logs": [...], "weight_logs": [...]}
+    as row tuples in the column order insert_dataset() uses. user_id and
+    food_id are 1-based positions.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    days = [end - timedelta(days=i) for i in range(years * 365 - 1, -1, -1)]
+
+    food_items = [(food_id, f"Bench food {food_id}", 1, rng.uniform(20, 700),
+                   rng.uniform(0, 40), rng.uniform(0, 90), rng.uniform(0, 35))
+                  for food_id in range(1, foods + 1)]
+
+    user_rows, food_logs, weight_logs = [], [], []
+    for user_id in range(1, users + 1):
+        height = rng.uniform(150, 200)
+        weight = rng.uniform(55, 120)
+        user_rows.append((user_id, username(user_id), height, round(weight, 1), rng.choice(("male", "female", "other"))))
+        for day in days:
+            for meal in MEALS:
+                if meal == "snack" and rng.random() < 0.5:
+                    continue
+                for food_id in rng.sample(range(1, foods + 1), rng.randint(1, 3)):
+                    food_logs.append((user_id, food_id, day, meal, round(rng.uniform(0.5, 3), 1)))
+            weight += rng.uniform(-0.3, 0.28)
+            if rng.random() < 0.8:
+                weight_logs.append((user_id, day, round(weight, 1)))
+
+    return {"food_items": food_items, "users": user_rows, "food_logs": food_logs, "weight_logs": weight_logs,
+            "first_day": days[0], "last_day": days[-1]}
+
+
+def insert_dataset(conn, data, password_hash):
+    """Replace the contents of the benchmark tables with data"""
+    cursor = conn.cursor()
+    try:
+        for table in _TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+        _insert_many(cursor, """
+            INSERT INTO food_items (food_id, name, default_serving_size, calories, protein, carbs, fat)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, data["food_items"])
+        _insert_many(cursor, """
+            INSERT INTO users (user_id, username, height_cm, weight_kg, gender, password_hash)
+            VALUES (%s, %s, %s, %s, %s, %s)
+        """, [row + (password_hash,) for row in data["users"]])
+        _insert_many(cursor, """
+            INSERT INTO food_logs (user_id, food_id, date, meal_type, quantity)
+            VALUES (%s, %s, %s, %s, %s)
+        """, data["food_logs"])
+        _insert_many(cursor, """
+            INSERT INTO weight_logs (user_id, date, weight_kg)
+            VALUES (%s, %s, %s)
+        """, data["weight_logs"])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def _insert_many(cursor, sql, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(sql, rows[start:start + BATCH_SIZE])
+
+
+def sizes(data):
+    return {name: len(data[name]) for name in ("users", "food_items", "food_logs", "weight_logs")}
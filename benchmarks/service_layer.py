@@ -0,0 +1,243 @@
+# benchmarks/service_layer.py
+"""
+Throughput and p50/p99 latency of the main service calls against a seeded
+local MySQL/MariaDB database or an embedded SQLite file (--backend sqlite).
+
+    python -m benchmarks.service_layer
+    python -m benchmarks.service_layer --users 50 --years 5 --iterations 500
+    python -m benchmarks.service_layer --backend sqlite
+    python -m benchmarks.service_layer --no-seed --compare benchmarks/results/service_layer-20260101-120000.json
+
+The database named by BENCH_MYSQL_DB (default calorie_tracker_bench) on the
+MYSQL_HOST from .env (or the SQLite file BENCH_SQLITE_PATH) is created if
+needed, migrated and refilled from a seeded generator (see dataset.py), so runs with the same arguments measure
+the same data. USDA searches go to a local stub server and the food cache
+lives in a temporary directory. Results are written as JSON to
+benchmarks/results/ (or --output); --compare prints the change in p50/p99
+against an earlier result file.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from benchmarks.dataset import PASSWORD, generate, insert_dataset, sizes, username
+from benchmarks.usda_stub import start_stub_server
+
+load_dotenv()
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+BENCH_DB = os.getenv("BENCH_MYSQL_DB", "calorie_tracker_bench")
+BENCH_SQLITE_PATH = os.getenv("BENCH_SQLITE_PATH", "data/calorie_tracker_bench.sqlite3")
+WARMUP_CALLS = 3
+
+
+# ----------------- Measurement -----------------
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure(call, iterations, warmup=WARMUP_CALLS):
+    """Run call(i) warmup + iterations times; stats over the timed iterations"""
+    for i in range(warmup):
+        call(-1 - i)
+    latencies = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        call(i)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(sum(latencies) / iterations, 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+# ----------------- Setup -----------------
+def prepare_environment(backend, search_latency_ms):
+    """Point the app at the benchmark database, a stub USDA server and a scratch food cache"""
+    app_db = os.getenv("MYSQL_DB")
+    if backend == "mysql" and app_db and app_db == BENCH_DB:
+        raise SystemExit(f"BENCH_MYSQL_DB must not be the app database ({app_db}); it is wiped on every run")
+    app_file = os.getenv("SQLITE_PATH", "data/calorie_tracker.sqlite3")
+    if backend == "sqlite" and os.path.abspath(app_file) == os.path.abspath(BENCH_SQLITE_PATH):
+        raise SystemExit(f"BENCH_SQLITE_PATH must not be the app database ({app_file}); it is wiped on every run")
+
+    stub = start_stub_server(latency_ms=search_latency_ms)
+    scratch = tempfile.mkdtemp(prefix="calorie-bench-")
+    os.environ.update({
+        "DB_BACKEND": backend,
+        "MYSQL_DB": BENCH_DB,
+        "SQLITE_PATH": BENCH_SQLITE_PATH,
+        "USDA_API_BASE": stub.base_url,
+        "USDA_API_KEY": "benchmark",
+        "FOOD_CACHE_PATH": os.path.join(scratch, "food_cache.sqlite3"),
+        "WRITE_JOURNAL_PATH": os.path.join(scratch, "write_journal.sqlite3"),
+    })
+    return stub
+
+
+def create_database():
+    import mysql.connector
+    conn = mysql.connector.connect(host=os.getenv("MYSQL_HOST"), user=os.getenv("MYSQL_USER"),
+                                   password=os.getenv("MYSQL_PASSWORD"))
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{BENCH_DB}`")
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def seed_database(backend, data):
+    from backend.auth.auth import hash_password
+    from backend.db.connection import get_connection
+    from backend.db.migrate import migrate
+    from backend.services.nutrition_summary import rebuild_summaries
+
+    if backend == "mysql":
+        create_database()
+        migrate(report=lambda message: None)
+    started = time.perf_counter()
+    with get_connection() as conn:
+        if not conn:
+            raise SystemExit("Could not connect to the benchmark database")
+        insert_dataset(conn, data, hash_password(PASSWORD))
+    rebuild_summaries()
+    return time.perf_counter() - started
+
+
+# ----------------- Benchmarks -----------------
+def run_benchmarks(data, iterations, login_iterations, seed):
+    from backend.auth.auth import login_user
+    from backend.services.food_log_service import get_day_totals
+    from backend.services.food_service import log_food, get_daily_food_logs, search_food
+    from backend.services.weight_service import get_weight_logs_for_user
+
+    rng = random.Random(seed)
+    users = len(data["users"])
+    foods = len(data["food_items"])
+    span = (data["last_day"] - data["first_day"]).days
+
+    def any_user():
+        return rng.randint(1, users)
+
+    def any_day():
+        return data["first_day"] + timedelta(days=rng.randint(0, span))
+
+    run_id = datetime.now().strftime("%H%M%S%f")
+    search_food("bench hit apple")
+
+    def quiet_login(_):
+        with contextlib.redirect_stdout(io.StringIO()):  # login_user prints on every call
+            assert login_user(username(any_user()), PASSWORD)
+
+    benchmarks = {
+        "log_food": (lambda _: log_food(any_user(), rng.randint(1, foods), rng.choice(("lunch", "dinner")),
+                                        round(rng.uniform(0.5, 3), 1), any_day()), iterations),
+        "get_daily_food_logs": (lambda _: get_daily_food_logs(any_user(), any_day()), iterations),
+        "get_day_totals": (lambda _: get_day_totals(any_user(), any_day()), iterations),
+        "get_weight_logs_for_user": (lambda _: get_weight_logs_for_user(any_user()), iterations),
+        "search_food_hit": (lambda _: search_food("bench hit apple"), iterations),
+        "search_food_miss": (lambda i: search_food(f"bench miss {run_id} {i}"), iterations),
+        "login_user": (quiet_login, login_iterations),
+    }
+    return {name: measure(call, count) for name, (call, count) in benchmarks.items()}
+
+
+# ----------------- Output -----------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results):
+    print(f"{'benchmark':<26} {'ops/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, r in results.items():
+        print(f"{name:<26} {r['ops_per_sec']:>9} {r['p50_ms']:>9} {r['p99_ms']:>9} {r['max_ms']:>9}")
+
+
+def print_comparison(previous, results):
+    print(f"\nvs {previous.get('git_commit')} ({previous.get('started_at')}):")
+    print(f"{'benchmark':<26} {'p50':>9} {'p99':>9}")
+    for name, r in results.items():
+        before = previous.get("results", {}).get(name)
+        if not before:
+            continue
+        changes = [f"{(r[key] - before[key]) / before[key] * 100:+.1f}%" if before[key] else "n/a"
+                   for key in ("p50_ms", "p99_ms")]
+        print(f"{name:<26} {changes[0]:>9} {changes[1]:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the service layer against a seeded local database")
+    parser.add_argument("--backend", choices=["mysql", "sqlite"], default="mysql")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--foods", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per benchmark")
+    parser.add_argument("--login-iterations", type=int, default=20, help="timed calls for login_user (bcrypt)")
+    parser.add_argument("--search-latency-ms", type=float, default=20, help="stub USDA response delay")
+    parser.add_argument("--no-seed", action="store_true", help="reuse the data from an earlier run with the same arguments")
+    parser.add_argument("--output", help="result file (default benchmarks/results/service_layer-<time>.json)")
+    parser.add_argument("--compare", help="earlier result file to compare p50/p99 against")
+    args = parser.parse_args(argv)
+
+    stub = prepare_environment(args.backend, args.search_latency_ms)
+    started_at = datetime.now()
+    data = generate(users=args.users, years=args.years, foods=args.foods, seed=args.seed)
+    try:
+        seed_seconds = None if args.no_seed else round(seed_database(args.backend, data), 2)
+        results = run_benchmarks(data, args.iterations, args.login_iterations, args.seed)
+    finally:
+        stub.shutdown()
+
+    report = {
+        "benchmark": "service_layer",
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "database": BENCH_DB if args.backend == "mysql" else BENCH_SQLITE_PATH,
+        "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "dataset": sizes(data),
+        "seed_seconds": seed_seconds,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"service_layer-{started_at:%Y%m%d-%H%M%S}.json")
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print_table(results)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print_comparison(json.load(f), results)
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# benchmarks/startup.py
+"""
+Startup cost: imports needed before the login window, time to first painted
+window, and when the background warm-up has finished.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --json
+
+Each run is a fresh interpreter. "lazy" is the app's real startup path;
+"eager" imports the dashboard up front (the old behaviour) for comparison.
+Without a display, first_window_ms is reported as null and only the import
+numbers are meaningful.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import tkinter as tk
+if sys.argv[1] == "eager":
+    import gui.screens.dashboard
+from gui.screens.login_screen import LoginScreen
+from gui.warmup import start_warmup, wait_for_warmup
+result = {"login_imports_ms": (time.perf_counter() - t0) * 1000}
+root = None
+try:
+    root = tk.Tk()
+    LoginScreen(root, on_login_success=None)
+    root.update()
+    result["first_window_ms"] = (time.perf_counter() - t0) * 1000
+except tk.TclError:
+    result["first_window_ms"] = None  # no display
+start_warmup()
+wait_for_warmup()
+result["warmup_done_ms"] = (time.perf_counter() - t0) * 1000
+if root is not None:
+    root.destroy()
+print(json.dumps(result))
+"""
+
+
+def run_once(mode):
+    started = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, mode],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def summarize(mode, results):
+    summary = {"mode": mode, "runs": len(results)}
+    for key in ("login_imports_ms", "first_window_ms", "warmup_done_ms", "process_ms"):
+        values = [r[key] for r in results if r[key] is not None]
+        summary[key] = round(statistics.median(values), 1) if values else None
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark time to first window")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", default=["lazy", "eager"], choices=["lazy", "eager"])
+    parser.add_argument("--json", action="store_true", help="print JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    if not args.json:
+        print(f"{'mode':>6} {'imports ms':>11} {'window ms':>10} {'warm-up ms':>11} {'process ms':>11}  (medians)")
+    for mode in args.modes:
+        summary = summarize(mode, [run_once(mode) for _ in range(args.runs)])
+        if args.json:
+            print(json.dumps(summary))
+        else:
+            print(f"{mode:>6} {summary['login_imports_ms']:>11} {str(summary['first_window_ms']):>10} "
+                  f"{summary['warmup_done_ms']:>11} {summary['process_ms']:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# benchmarks/usda_stub.py
+"""
+Local stand-in for the FoodData Central search endpoint, so search_food cache
+misses can be measured without the network or an API key.
+
+    server = start_stub_server(latency_ms=50)
+    os.environ["USDA_API_BASE"] = server.base_url
+    ...
+    server.shutdown()
+"""
+import json
+import threading
+import time
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+def fake_foods(query, page_size=10):
+    """Deterministic search results in the /foods/search shape"""
+    base = zlib.crc32(query.encode("utf-8"))
+    foods = []
+    for i in range(page_size):
+        seed = (base + i * 7919) % 10000
+        foods.append({
+            "fdcId": 900000 + seed,
+            "description": f"{query} {i + 1}",
+            "foodNutrients": [
+                {"nutrientId": 1008, "nutrientName": "Energy", "unitName": "KCAL", "value": 50 + seed % 500},
+                {"nutrientId": 1003, "nutrientName": "Protein", "unitName": "G", "value": seed % 30},
+                {"nutrientId": 1005, "nutrientName": "Carbohydrate, by difference", "unitName": "G",
+                 "value": seed % 60},
+                {"nutrientId": 1004, "nutrientName": "Total lipid (fat)", "unitName": "G", "value": seed % 25},
+            ],
+        })
+    return foods
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.endswith("/foods/search"):
+            self.send_error(404)
+            return
+        params = parse_qs(url.query)
+        time.sleep(self.server.latency_ms / 1000)
+        body = json.dumps({"foods": fake_foods(params.get("query", [""])[0],
+                                               int(params.get("pageSize", ["10"])[0]))}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+
+def start_stub_server(latency_ms=0, host="127.0.0.1", port=0):
+    """Serve on a background thread; .base_url is what USDA_API_BASE should be"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.latency_ms = latency_ms
+    server.base_url = f"http://{host}:{server.server_address[1]}/fdc/v1"
+    threading.Thread(target=server.serve_forever, name="usda-stub", daemon=True).start()
+    return server
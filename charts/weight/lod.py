@@ -0,0 +1,154 @@
+# charts/weight/lod.py
+"""
+Level-of-detail selection for long time series (weight, BMI).
+
+Charts never need more points than they have pixels. level_of_detail() cuts
+a series to the visible date window and, if it still has more points than
+the pixel budget, reduces it with one of:
+
+    "lttb"      Largest-Triangle-Three-Buckets (keeps the visual shape)
+    "minmax"    min and max of each pixel bucket (keeps spikes)
+    "aggregate" daily / weekly / monthly means, finest that fits
+
+All work is NumPy; the only Python loop is LTTB's, which runs once per output
+point, so cost is bounded by the pixel budget rather than the row count.
+"""
+import numpy as np
+
+PERIODS = ("day", "week", "month")
+POINTS_PER_PIXEL = 0.5  # one point every 2 px is plenty for a line chart
+
+
+def as_day_numbers(dates):
+    """Sequence of date/datetime/datetime64 -> float days since 1970-01-01"""
+    return np.asarray(dates, dtype="datetime64[D]").astype("int64").astype(float)
+
+
+def point_budget(pixel_width, points_per_pixel=POINTS_PER_PIXEL):
+    return max(3, int(pixel_width * points_per_pixel))
+
+
+# ----------------- Reducers -----------------
+def lttb_indices(x, y, threshold):
+    """Indices of the points LTTB keeps (first and last always included)"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # threshold - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_indices(x, y, buckets):
+    """Indices of the min and max point in each of `buckets` equal-width x buckets"""
+    n = len(x)
+    if n <= 2 * buckets:
+        return np.arange(n)
+
+    span = (x[-1] - x[0]) or 1.0
+    bucket = np.minimum(((x - x[0]) / span * buckets).astype(int), buckets - 1)
+    order = np.lexsort((y, bucket))  # by bucket, then by value
+    sorted_bucket = bucket[order]
+    boundary = sorted_bucket[1:] != sorted_bucket[:-1]
+    lowest = order[np.r_[True, boundary]]
+    highest = order[np.r_[boundary, True]]
+    return np.unique(np.r_[0, lowest, highest, n - 1])
+
+
+def aggregate(dates, series, period):
+    """
+    Mean of each series per day/week/month.
+    Returns (bucket start dates as datetime64[D], [means per series]).
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    if period == "day":
+        keys = days
+    elif period == "week":
+        # Monday-aligned weeks (1970-01-01 was a Thursday)
+        day_numbers = days.astype("int64")
+        keys = (day_numbers - (day_numbers + 3) % 7).astype("datetime64[D]")
+    elif period == "month":
+        keys = days.astype("datetime64[M]").astype("datetime64[D]")
+    else:
+        raise ValueError(f"Unknown period {period!r}; expected one of {PERIODS}")
+
+    starts, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse)
+    means = [np.bincount(inverse, weights=np.asarray(s, dtype=float)) / counts for s in series]
+    return starts, means
+
+
+def choose_period(span_days, budget):
+    """Finest aggregate period whose bucket count fits the point budget"""
+    for period, length in (("day", 1), ("week", 7), ("month", 30.44)):
+        if span_days / length <= budget:
+            return period
+    return "month"
+
+
+# ----------------- Entry point -----------------
+def level_of_detail(x, series, pixel_width, window=None, method="lttb"):
+    """
+    Reduce (x, *series) for drawing pixel_width pixels of the given x window.
+
+    x        ascending float x values (e.g. day numbers or matplotlib date nums)
+    series   list of y arrays sharing x; the first one drives point selection
+    window   (lo, hi) visible x range, or None for everything
+
+    Returns (x, [series...], reduced) where reduced is False if every point in
+    the window is drawn as-is.
+    """
+    x = np.asarray(x, dtype=float)
+    series = [np.asarray(s, dtype=float) for s in series]
+
+    if window is not None and len(x):
+        lo, hi = window
+        # One extra point each side so lines run to the axes edges
+        start = max(np.searchsorted(x, lo, side="left") - 1, 0)
+        end = min(np.searchsorted(x, hi, side="right") + 1, len(x))
+        x = x[start:end]
+        series = [s[start:end] for s in series]
+
+    budget = point_budget(pixel_width)
+    if len(x) <= budget:
+        return x, series, False
+
+    if method == "aggregate":
+        # x is in days (matplotlib date numbers count days since 1970 too)
+        day_x = np.floor(x).astype("int64").astype("datetime64[D]")
+        period = choose_period(x[-1] - x[0], budget)
+        starts, means = aggregate(day_x, series, period)
+        x = starts.astype("int64").astype(float)
+        if len(x) <= budget:
+            return x, means, True
+        # Decades of monthly means can still exceed the budget
+        series = means
+        method = "lttb"
+
+    if method == "minmax":
+        keep = minmax_indices(x, series[0], budget // 2)
+    elif method == "lttb":
+        keep = lttb_indices(x, series[0], budget)
+    else:
+        raise ValueError(f"Unknown LOD method {method!r}")
+    return x[keep], [s[keep] for s in series], True
@@ -1,5 +1,6 @@
 import matplotlib.pyplot as plt
 from datetime import datetime
+from charts.weight.lod import as_day_numbers, level_of_detail
 
 def plot_weight_history(history):
     """
@@ -16,15 +17,22 @@ def plot_weight_history(history):
 
     fig, ax1 = plt.subplots(figsize=(10, 5))
 
+    # Never draw more points than the axes have pixels for
+    x, (weights, bmis), reduced = level_of_detail(
+        as_day_numbers(dates), [weights, bmis], pixel_width=fig.get_figwidth() * fig.dpi
+    )
+    ax1.xaxis.axis_date()
+    marker, bmi_marker = (None, None) if reduced else ('o', 'x')
+
     # Weight line
-    ax1.plot(dates, weights, color='blue', marker='o', label='Weight (kg)')
+    ax1.plot(x, weights, color='blue', marker=marker, label='Weight (kg)')
     ax1.set_xlabel('Date')
     ax1.set_ylabel('Weight (kg)', color='blue')
     ax1.tick_params(axis='y', labelcolor='blue')
 
     # BMI line on second axis
     ax2 = ax1.twinx()
-    ax2.plot(dates, bmis, color='green', marker='x', linestyle='--', label='BMI')
+    ax2.plot(x, bmis, color='green', marker=bmi_marker, linestyle='--', label='BMI')
     ax2.set_ylabel('BMI', color='green')
     ax2.tick_params(axis='y', labelcolor='green')
 
@@ -37,3 +45,4 @@ def plot_weight_history(history):
     plt.grid(True)
     plt.tight_layout()
     plt.show()
+    plt.close(fig)  # release the pyplot-managed figure
@@ -3,9 +3,13 @@ from gui.screens.food_entry import FoodEntryScreen
 from gui.screens.weight_entry import WeightEntryScreen
 from gui.widgets.calendar_panel import CalendarPanel
 from gui.widgets.calorie_goal import CalorieGoalPanel
+from backend.services.snapshot_service import get_cached_day_snapshot
+from backend.services.write_journal import get_write_journal
 from datetime import date
 
 class Dashboard(tk.Frame):
+    SYNC_POLL_MS = 1000
+
     def __init__(self, parent, user):
         super().__init__(parent)
         self.parent = parent
@@ -24,28 +28,44 @@ class Dashboard(tk.Frame):
         # ---------- Header ----------
         tk.Label(self, text=f"Welcome, {user['username']}", font=("Helvetica", 16, "bold"))\
             .grid(row=0, column=0, columnspan=2, sticky="w", padx=20, pady=10)
+        self.sync_label = tk.Label(self, text="", font=("Helvetica", 10))
+        self.sync_label.grid(row=0, column=1, sticky="e", padx=20, pady=10)
 
         # ---------- Top-left: Calendar ----------
-        self.calendar = CalendarPanel(self, on_date_selected=self.on_date_selected)
+        self.calendar = CalendarPanel(
+            self,
+            on_date_selected=self.on_date_selected,
+            user_id=self.user_id,
+            get_target=lambda: self.goal_panel.get_daily_target()
+        )
         self.calendar.grid(row=1, column=0, sticky="nw", padx=20, pady=5)
 
         # ---------- Top-right: Calorie Goal ----------
         self.goal_panel = CalorieGoalPanel(self, user)
         self.goal_panel.grid(row=1, column=1, sticky="ne", padx=20, pady=5)
 
+        # ---------- Day snapshot shared by all panels ----------
+        snapshot = self.fetch_snapshot(self.selected_date)
+
         # ---------- Bottom-left: Food Entry ----------
-        self.food_panel = FoodEntryScreen(self, user_id=self.user_id)
+        self.food_panel = FoodEntryScreen(self, user_id=self.user_id, snapshot=snapshot,
+                                          on_logs_changed=self.calendar.refresh)
         self.food_panel.grid(row=2, column=0, sticky="nsew", padx=20, pady=10)
         self.rowconfigure(2, weight=1)  # allow food panel to expand
         self.columnconfigure(0, weight=1)  # allow left column to expand
 
         # ---------- Bottom-right: Weight Entry ----------
-        self.weight_panel = WeightEntryScreen(self, user_id=self.user_id)
+        self.weight_panel = WeightEntryScreen(self, user_id=self.user_id, on_logs_changed=self.calendar.refresh)
         self.weight_panel.grid(row=2, column=1, sticky="nsew", padx=20, pady=10)
         self.columnconfigure(1, weight=1)  # allow right column to expand
 
         # ---------- Initial load ----------
-        self.update_daily_logs(self.selected_date)
+        self.render_snapshot(snapshot, food=False)
+
+        # ---------- Background sync of journalled logs ----------
+        self.journal = get_write_journal()
+        self.synced_count = self.journal.status()["applied"]
+        self.poll_sync()
 
     # ---------------- Calendar callback ----------------
     def on_date_selected(self, selected_date):
@@ -54,12 +74,49 @@ class Dashboard(tk.Frame):
 
     # ---------------- Update all daily logs ----------------
     def update_daily_logs(self, log_date):
-        # Update food and weight panels for the selected date
-        self.food_panel.update_daily_logs(log_date)
-        self.weight_panel.update_daily_logs(log_date)
-
-        # Update food bar graph with calorie goal if applicable
-        if hasattr(self, "goal_panel"):
-            target = self.goal_panel.daily_target
-            if target is not None:
-                self.food_panel.update_bar_graph(target)
+        # One batched read feeds every panel for the selected date
+        self.render_snapshot(self.fetch_snapshot(log_date))
+
+    def fetch_snapshot(self, log_date):
+        # Served from the day cache when this date was viewed recently;
+        # the neighbouring days are prefetched in the background
+        return get_cached_day_snapshot(
+            self.user_id,
+            log_date,
+            activity_level=self.goal_panel.activity_var.get(),
+            weight_goal=self.goal_panel.goal_var.get()
+        )
+
+    def render_snapshot(self, snapshot, food=True):
+        log_date = snapshot["date"]
+        self.goal_panel.apply_snapshot(snapshot)
+        if food:
+            self.food_panel.update_daily_logs(log_date, snapshot)
+        self.weight_panel.update_daily_logs(log_date, snapshot)
+
+        # Update food bar graph with calorie goal
+        self.food_panel.update_bar_graph(snapshot["target"])
+        # Heatmap colours depend on the target; the month itself is cached
+        self.calendar.refresh()
+
+    # ---------------- Pending-sync indicator ----------------
+    def poll_sync(self):
+        status = self.journal.status()
+        if status["applied"] != self.synced_count:
+            # Entries reached MySQL since the last poll: re-read so they show as saved
+            self.synced_count = status["applied"]
+            self.update_daily_logs(self.selected_date)
+
+        if status["pending"] == 0 and status["parked"] == 0:
+            text, colour = "All changes saved", "dark green"
+        elif not status["online"]:
+            text, colour = f"Offline - {status['pending']} change(s) waiting to sync", "red"
+        elif status["pending"]:
+            text, colour = f"Syncing {status['pending']} change(s)...", "dark orange"
+        else:
+            text, colour = f"{status['parked']} change(s) could not be saved", "red"
+            if status["last_error"]:
+                text += f": {status['last_error']}"
+        self.sync_label.config(text=text, fg=colour)
+
+        self.after(self.SYNC_POLL_MS, self.poll_sync)
@@ -1,18 +1,35 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from backend.services.food_service import get_daily_food_logs, search_food, log_food, update_food_log_quantity
-from backend.db.connection import create_connection
+from backend.services.food_service import (
+    get_daily_food_logs,
+    search_food_async,
+    local_search_food,
+    get_food_index,
+    update_food_log_quantity,
+    delete_food_log_entry
+)
+from backend.services.write_journal import get_write_journal
+from gui.widgets.virtual_list import VirtualList
+from gui.widgets.charts import CalorieBarChart
 from datetime import date
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 
 class FoodEntryScreen(tk.Frame):
     MEALS = ['breakfast', 'lunch', 'dinner', 'snack']
+    SEARCH_POLL_MS = 50
+    DEBOUNCE_MS = 400      # pause in typing before asking USDA
+    MIN_LOCAL_HITS = 5     # fewer local matches than this triggers a remote search
+    MIN_QUERY_CHARS = 2
+    RESULT_LIMIT = 15
 
-    def __init__(self, parent, user_id):
+    def __init__(self, parent, user_id, snapshot=None, on_logs_changed=None):
         super().__init__(parent)
         self.user_id = user_id
+        self.on_logs_changed = on_logs_changed  # called after this screen writes logs
         self.current_results = []
+        self.search_future = None
+        self.search_seq = 0  # bumped per search so stale results are dropped
+        self.remote_after_id = None
+        self.last_typed_query = ""
         self.current_date = date.today()
         self.daily_budget = 2000  # default daily calories
         self.planned_deficit = 0  # default deficit
@@ -35,6 +52,8 @@ class FoodEntryScreen(tk.Frame):
         tk.Label(self, text="Food Name:").grid(row=2, column=0, sticky="w", padx=5)
         self.food_entry = tk.Entry(self, width=30)
         self.food_entry.grid(row=2, column=1, sticky="w")
+        self.food_entry.bind("<Return>", lambda e: self.search_food())
+        self.food_entry.bind("<KeyRelease>", self.on_food_typed)
         tk.Button(self, text="Search", command=self.search_food).grid(row=2, column=2, padx=5)
 
         # Search results
@@ -54,30 +73,41 @@ class FoodEntryScreen(tk.Frame):
         tk.Button(self, text="Set Daily Budget / Deficit", command=self.set_daily_budget)\
             .grid(row=5, column=2, padx=5)
 
-        # Logs frame
-        self.logs_frame = tk.Frame(self, bd=1, relief="sunken")
-        self.logs_frame.grid(row=6, column=0, columnspan=3, sticky="nsew", pady=5)
-        self.logs_frame.columnconfigure(0, weight=1)
+        # Logs list (meal headers + entries)
+        self.logs_list = VirtualList(
+            self,
+            columns=[("Food", 45)],
+            render=self.render_log_row,
+            key=lambda row: row.get('log_id', row['meal_type']),
+            actions=[("Edit", self.edit_food_log), ("Delete", self.delete_food_log)],
+            height=8,
+            is_header=lambda row: 'log_id' not in row,
+            empty_text="No foods logged for this day",
+            show_headings=False
+        )
+        self.logs_list.config(bd=1, relief="sunken")
+        self.logs_list.grid(row=6, column=0, columnspan=3, sticky="nsew", pady=5)
+
+        # Chart
+        self.calorie_chart = CalorieBarChart(self, figsize=(6,3), dpi=100)
+        self.calorie_chart.grid(row=7, column=0, columnspan=3, sticky="nsew", pady=10)
 
-        # Chart frame
-        self.chart_frame = tk.Frame(self)
-        self.chart_frame.grid(row=7, column=0, columnspan=3, sticky="nsew", pady=10)
-        self.chart_frame.columnconfigure(0, weight=1)
-        self.chart_frame.rowconfigure(0, weight=1)
-        self.canvas = None
+        # Start loading the local food index in the background
+        get_food_index()
 
         # Initial load
-        self.update_daily_logs(self.current_date)
+        self.update_daily_logs(snapshot["date"] if snapshot else self.current_date, snapshot)
 
     # ----------------- Update logs -----------------
-    def update_daily_logs(self, log_date):
+    def update_daily_logs(self, log_date, snapshot=None):
+        """Render the day's logs; pass a dashboard snapshot to skip the query"""
         self.current_date = log_date
 
-        # Clear logs
-        for widget in self.logs_frame.winfo_children():
-            widget.destroy()
-
-        logs, totals = get_daily_food_logs(self.user_id, log_date=log_date)
+        if snapshot is not None:
+            logs, totals = snapshot["food_logs"], snapshot["totals"]
+        else:
+            logs, totals = get_daily_food_logs(self.user_id, log_date=log_date)
+        logs = list(logs) + self.pending_logs(log_date)
 
         total_calories = sum(log['total_calories'] for log in logs) if logs else 0
         target = self.daily_budget - self.planned_deficit
@@ -85,52 +115,131 @@ class FoodEntryScreen(tk.Frame):
             text=f"Total Calories: {total_calories} / Target: {target}"
         )
 
-        if not logs:
-            tk.Label(self.logs_frame, text="No foods logged for this day").grid(sticky="w")
-            self.create_calorie_chart(total_calories)
-            return
-
-        # Group by meal
+        # Group by meal: a header row per meal followed by its entries
         meals = {meal: [] for meal in self.MEALS}
         for log in logs:
             meals[log['meal_type']].append(log)
 
-        row_idx = 0
+        rows = []
         for meal, items in meals.items():
-            if not items:
-                continue
-            tk.Label(self.logs_frame, text=meal.capitalize(), font=("Helvetica", 12, "bold"))\
-                .grid(row=row_idx, column=0, sticky="w", pady=(5,0))
-            row_idx += 1
-            for log in items:
-                tk.Label(self.logs_frame, text=f"{log['name']} x {log['quantity']} | {log['total_calories']} kcal")\
-                    .grid(row=row_idx, column=0, sticky="w")
-                tk.Button(self.logs_frame, text="Edit", width=5, command=lambda l=log: self.edit_food_log(l))\
-                    .grid(row=row_idx, column=1, padx=5)
-                tk.Button(self.logs_frame, text="Delete", width=5, command=lambda l=log: self.delete_food_log(l))\
-                    .grid(row=row_idx, column=2, padx=5)
-                row_idx += 1
+            if items:
+                rows.append({'meal_type': meal})
+                rows.extend(items)
+        self.logs_list.set_rows(rows)
 
         # Update chart
         self.create_calorie_chart(total_calories)
 
-    # ----------------- CRUD -----------------
+    def pending_logs(self, log_date):
+        """Journalled entries for the day that haven't reached MySQL yet, as log rows"""
+        rows = []
+        for entry in get_write_journal().pending("food", self.user_id, log_date):
+            food, quantity = entry['food'], entry['quantity']
+            rows.append({
+                'log_id': f"pending:{entry['key']}",
+                'food_id': food['food_id'],
+                'date': log_date,
+                'name': food['name'],
+                'meal_type': entry['meal_type'],
+                'quantity': quantity,
+                'total_calories': round((food.get('calories') or 0) * quantity, 1),
+                'pending': True
+            })
+        return rows
+
+    def logs_changed(self):
+        self.update_daily_logs(self.current_date)
+        if self.on_logs_changed:
+            self.on_logs_changed()
+
+    def render_log_row(self, row):
+        if 'log_id' not in row:
+            return (row['meal_type'].capitalize(),)
+        text = f"{row['name']} x {row['quantity']} | {row['total_calories']} kcal"
+        return (text + " (not synced)" if row.get('pending') else text,)
+
+    # ----------------- Search -----------------
+    def on_food_typed(self, event=None):
+        """Search-as-you-type: local index right away, USDA only after a pause"""
+        query = self.food_entry.get().strip()
+        if query == self.last_typed_query:
+            return  # arrows, Return, modifiers...
+        self.last_typed_query = query
+        self.cancel_pending_remote()
+        self.supersede_search()
+
+        if len(query) < self.MIN_QUERY_CHARS:
+            self.show_results([])
+            return
+
+        local = local_search_food(query, limit=self.RESULT_LIMIT)
+        self.show_results(local)
+        if len(local) < self.MIN_LOCAL_HITS:
+            self.remote_after_id = self.after(self.DEBOUNCE_MS, self.search_food)
+
     def search_food(self):
-        query = self.food_entry.get()
+        self.cancel_pending_remote()
+        query = self.food_entry.get().strip()
         if not query:
             messagebox.showwarning("Input required", "Enter a food name to search.")
             return
-        results = search_food(query)
+
+        self.supersede_search()
+        local = local_search_food(query, limit=self.RESULT_LIMIT)
+        self.show_results(local, status="Searching…")
+
+        self.search_future = search_food_async(query)
+        self.after(self.SEARCH_POLL_MS, self.poll_search, self.search_seq, self.search_future, local, 0)
+
+    def poll_search(self, seq, future, local, ticks):
+        """Runs on the Tk thread until the background search finishes"""
+        if seq != self.search_seq:
+            return  # a newer search replaced this one
+        if not future.done():
+            ticks += 1
+            self.results_listbox.delete(tk.END)
+            self.results_listbox.insert(tk.END, "Searching" + "." * (1 + ticks // 5 % 3))
+            self.after(self.SEARCH_POLL_MS, self.poll_search, seq, future, local, ticks)
+            return
+
+        self.search_future = None
+        try:
+            remote = future.result()
+        except Exception as e:
+            self.show_results(local, status=f"USDA search failed: {e}")
+            return
+
+        # Local hits first, then anything new from USDA
+        seen = {str(food['food_id']) for food in local}
+        merged = local + [food for food in remote if str(food['food_id']) not in seen]
+        self.show_results(merged, status=None if merged else "No results")
+
+    def supersede_search(self):
+        self.search_seq += 1
+        if self.search_future is not None:
+            self.search_future.cancel()
+            self.search_future = None
+
+    def cancel_pending_remote(self):
+        if self.remote_after_id is not None:
+            self.after_cancel(self.remote_after_id)
+            self.remote_after_id = None
+
+    def show_results(self, results, status=None):
+        """Fill the listbox; a trailing status line is not selectable as a food"""
         self.current_results = results
         self.results_listbox.delete(0, tk.END)
         for food in results:
             self.results_listbox.insert(
                 tk.END, f"{food['name']} (Calories: {food.get('calories','N/A')})"
             )
+        if status:
+            self.results_listbox.insert(tk.END, status)
 
+    # ----------------- CRUD -----------------
     def log_selected_food(self):
         selection = self.results_listbox.curselection()
-        if not selection:
+        if not selection or selection[0] >= len(self.current_results):
             messagebox.showwarning("Select a food", "Please select a food from the list.")
             return
         food = self.current_results[selection[0]]
@@ -141,44 +250,32 @@ class FoodEntryScreen(tk.Frame):
             messagebox.showerror("Invalid quantity", "Enter a valid number.")
             return
 
-        self.add_food_item_if_not_exists(food)
-        log_food(self.user_id, food['food_id'], self.meal_var.get(), qty, self.current_date)
-        self.update_daily_logs(self.current_date)
+        # Journalled locally and applied to MySQL in the background
+        get_write_journal().add_food_entry(self.user_id, food, self.meal_var.get(), qty, self.current_date)
+        self.logs_changed()
 
     def edit_food_log(self, log):
+        if log.get('pending'):
+            messagebox.showinfo("Not synced yet", "This entry is still being saved; try again in a moment.")
+            return
         from tkinter.simpledialog import askfloat
         new_qty = askfloat("Edit Quantity", f"{log['name']} ({log['meal_type']}):", initialvalue=log['quantity'])
         if new_qty is None:
             return
-        update_food_log_quantity(self.user_id, log['food_id'], log['meal_type'], new_qty, log['date'])
-        self.update_daily_logs(self.current_date)
+        if not update_food_log_quantity(self.user_id, log['food_id'], log['date'], log['meal_type'], new_qty):
+            messagebox.showerror("Not saved", "Could not reach the database; try again later.")
+            return
+        self.logs_changed()
 
     def delete_food_log(self, log):
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM food_logs WHERE log_id=%s", (log['log_id'],))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        self.update_daily_logs(self.current_date)
-
-    def add_food_item_if_not_exists(self, food):
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT IGNORE INTO food_items (food_id, name, calories, protein, carbs, fat)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """, (
-            food['food_id'],
-            food['name'],
-            food.get('calories', 0),
-            food.get('protein', 0),
-            food.get('carbs', 0),
-            food.get('fat', 0)
-        ))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        if log.get('pending'):
+            messagebox.showinfo("Not synced yet", "This entry is still being saved; try again in a moment.")
+            return
+        # Through the service so the day's nutrition summary is refreshed too
+        if not delete_food_log_entry(self.user_id, log['food_id'], log['date'], log['meal_type']):
+            messagebox.showerror("Not deleted", "Could not reach the database; try again later.")
+            return
+        self.logs_changed()
 
     # ----------------- Budget / Deficit -----------------
     def set_daily_budget(self):
@@ -192,24 +289,8 @@ class FoodEntryScreen(tk.Frame):
 
     # ----------------- Calorie Chart -----------------
     def create_calorie_chart(self, total_calories):
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-
         target = self.daily_budget - self.planned_deficit
-        color = 'green' if total_calories <= target else 'red'
-
-        fig = Figure(figsize=(6,3), dpi=100)
-        ax = fig.add_subplot(111)
-        ax.bar(['Calories'], [total_calories], color=color)
-        ax.axhline(target, color='blue', linestyle='--', label='Planned Target')
-        ax.set_ylabel("Calories")
-        ax.set_ylim(0, max(total_calories, target) * 1.2)
-        ax.legend()
-        ax.grid(True)
-
-        self.canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
+        self.calorie_chart.set_values(total_calories, target)
 
     def update_bar_graph(self, daily_target):
         # Placeholder: just store the target
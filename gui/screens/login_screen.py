@@ -1,10 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
-from backend.auth.auth import register_user, login_user
-from gui.screens.dashboard import Dashboard
+
+# Auth (bcrypt, mysql.connector) and the dashboard (matplotlib, tkcalendar,
+# ...) are imported on first use so this window paints with tkinter alone;
+# gui.warmup loads them in the background meanwhile.
 
 
 class LoginScreen(tk.Frame):
+    POLL_MS = 50
+
     def __init__(self, parent, on_login_success):
         super().__init__(parent)
         self.parent = parent
@@ -92,6 +96,25 @@ class LoginScreen(tk.Frame):
         else:
             self.handle_login(username, password)
 
+    def run_in_background(self, future, on_done):
+        """Keep the window responsive while bcrypt runs on the auth pool"""
+        self.action_button.config(state="disabled")
+        self.toggle_button.config(state="disabled")
+        self.after(self.POLL_MS, self.poll_future, future, on_done)
+
+    def poll_future(self, future, on_done):
+        if not future.done():
+            self.after(self.POLL_MS, self.poll_future, future, on_done)
+            return
+        self.action_button.config(state="normal")
+        self.toggle_button.config(state="normal")
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        on_done(result)
+
     # ---------------- Signup ----------------
 
     def handle_signup(self, username, password):
@@ -112,51 +135,25 @@ class LoginScreen(tk.Frame):
 
         gender = self.gender_var.get().strip() or None
 
-        if register_user(username, password, height_cm=height_cm, weight_kg=weight_kg, gender=gender):
-            messagebox.showinfo("Success", "Account created. You can now log in.")
+        from backend.auth.auth import register_user_async
+        future = register_user_async(username, password, height_cm=height_cm, weight_kg=weight_kg, gender=gender)
+        self.run_in_background(future, lambda ok: self.signup_finished(ok, username))
+
+    def signup_finished(self, success, username):
+        if success:
+            messagebox.showinfo("Success", f"User '{username}' registered. You can now log in.")
             self.toggle_mode()
 
     # ---------------- Login ----------------
 
-    def handle_action(self):
-        username = self.username_var.get().strip()
-        password = self.password_var.get().strip()
-
-        if not username or not password:
-            messagebox.showerror("Missing info", "Username and password are required.")
-            return
+    def handle_login(self, username, password):
+        from backend.auth.auth import login_user_async
+        self.run_in_background(login_user_async(username, password), self.login_finished)
 
-        if self.is_signup:
-            # Height
-            try:
-                ft = int(self.height_ft_var.get()) if self.height_ft_var.get() else 0
-                inch = int(self.height_in_var.get()) if self.height_in_var.get() else 0
-                height_cm = (ft * 12 + inch) * 2.54
-            except ValueError:
-                messagebox.showerror("Invalid input", "Height must be numbers.")
-                return
-
-            # Weight
-            try:
-                lbs = float(self.weight_lbs_var.get()) if self.weight_lbs_var.get() else None
-                weight_kg = lbs * 0.453592 if lbs else None
-            except ValueError:
-                messagebox.showerror("Invalid input", "Weight must be a number.")
-                return
-
-            gender = self.gender_var.get().strip() or None
-
-            success = register_user(username, password, height_cm=height_cm, weight_kg=weight_kg, gender=gender)
-            if success:
-                messagebox.showinfo("Success", f"User '{username}' registered. You can now log in.")
-                self.toggle_mode()
-            return
-
-        # LOGIN
-        user = login_user(username, password)
+    def login_finished(self, user):
         if user:
+            from gui.screens.dashboard import Dashboard
             self.destroy()
             Dashboard(self.parent, user)
         else:
             messagebox.showerror("Login failed", "Invalid username or password.")
-
@@ -2,27 +2,23 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog
 from datetime import date
 from backend.services.weight_service import (
-    get_weight_history,
-    log_weight,
-    get_weight_logs_for_user,
+    get_weight_series,
     update_weight_log,
-    delete_weight_log
+    delete_weight_log,
+    WEIGHT_PAGE_SIZE
 )
-from backend.db.connection import create_connection
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from backend.services.weight_series import WeightSeries, KG_PER_LB
+from backend.services.write_journal import get_write_journal
+from gui.widgets.virtual_list import VirtualList
+from gui.widgets.charts import WeightChart
 
-BMI_CATEGORIES = [
-    (0, 18.5, "Underweight"),
-    (18.5, 24.9, "Normal"),
-    (25, 29.9, "Overweight"),
-    (30, 1000, "Obese")
-]
+TREND_WINDOW_DAYS = 28  # trend slope shown next to the BMI
 
 class WeightEntryScreen(tk.Frame):
-    def __init__(self, parent, user_id):
+    def __init__(self, parent, user_id, on_logs_changed=None):
         super().__init__(parent)
         self.user_id = user_id
+        self.on_logs_changed = on_logs_changed  # called after this screen writes logs
 
         # ---------- Configure grid ----------
         self.grid(sticky="nsew")
@@ -49,19 +45,26 @@ class WeightEntryScreen(tk.Frame):
 
         # ---------- Weight Logs Label ----------
         logs_label = tk.Label(self, text="Weight Logs:", font=("Helvetica", 12, "bold"))
-        logs_label.grid(row=3, column=0, columnspan=2, sticky="w", pady=(10,0))
-
-        # ---------- Chart Frame ----------
-        self.chart_frame = tk.Frame(self)
-        self.chart_frame.grid(row=4, column=0, columnspan=2, sticky="nsew", pady=10)
-        self.chart_frame.columnconfigure(0, weight=1)
-        self.chart_frame.rowconfigure(0, weight=1)
-        self.canvas = None
-
-        # ---------- Weight Logs Frame ----------
-        self.logs_frame = tk.Frame(self)
-        self.logs_frame.grid(row=5, column=0, columnspan=2, sticky="nsew")
-        self.logs_frame.columnconfigure(0, weight=1)
+        logs_label.grid(row=3, column=0, sticky="w", pady=(10,0))
+        self.older_button = tk.Button(self, text="Load older", command=self.load_older_logs, state="disabled")
+        self.older_button.grid(row=3, column=1, sticky="e", pady=(10,0))
+
+        # ---------- Chart ----------
+        self.weight_chart = WeightChart(self, figsize=(8,3), dpi=100)
+        self.weight_chart.grid(row=4, column=0, columnspan=2, sticky="nsew", pady=10)
+
+        # ---------- Weight Logs List ----------
+        self.series = WeightSeries.from_rows([])  # the loaded (newest) part of the history
+        self.logs_list = VirtualList(
+            self,
+            columns=[("Date", 12), ("Weight (lb)", 10), ("BMI", 6)],
+            render=self.render_weight_row,
+            key=lambda log: log['log_id'],
+            actions=[("Edit", self.edit_weight_log), ("Delete", self.delete_weight_log)],
+            height=8,
+            empty_text="No logs"
+        )
+        self.logs_list.grid(row=5, column=0, columnspan=2, sticky="nsew")
 
     # ------------------ Weight Logging ------------------
     def log_weight(self):
@@ -73,111 +76,132 @@ class WeightEntryScreen(tk.Frame):
             messagebox.showerror("Invalid weight", "Enter a number greater than 0.")
             return
 
-        weight_kg = round(weight_lb * 0.453592, 2)
-        log_weight(user_id=self.user_id, log_date=date.today(), weight_kg=weight_kg)
+        weight_kg = round(weight_lb * KG_PER_LB, 2)
+        # Journalled locally and applied to MySQL in the background
+        get_write_journal().add_weight(self.user_id, date.today(), weight_kg)
         messagebox.showinfo("Logged", f"Weight {weight_lb} lb logged for today.")
         self.weight_var.set("")
-        self.update_daily_logs(date.today())
+        self.logs_changed()
 
     # ------------------ Public API ------------------
-    def update_daily_logs(self, log_date):
-        self.refresh_bmi()
-        self.refresh_chart()
-        self.refresh_weight_logs()
+    def update_daily_logs(self, log_date, snapshot=None):
+        """Refresh BMI, chart and log list from one series (or a dashboard snapshot)"""
+        if snapshot is not None:
+            series = snapshot["weight_series"]
+        else:
+            # Keep as many entries as are already loaded, but at least a page
+            series = get_weight_series(self.user_id, limit=max(WEIGHT_PAGE_SIZE, len(self.series)),
+                                       newest_first=True)
+        self.show_series(series)
+
+    def logs_changed(self):
+        self.update_daily_logs(date.today())
+        if self.on_logs_changed:
+            self.on_logs_changed()
+
+    def show_series(self, series):
+        series = self.with_pending(series)
+        self.series = series
+        self.refresh_bmi(series)
+        self.refresh_chart(series)
+        self.refresh_weight_logs(series)
+        # A short page means there is nothing older to load
+        self.older_button.config(state="normal" if len(series) >= WEIGHT_PAGE_SIZE else "disabled")
+
+    def with_pending(self, series):
+        """
+        series with journalled weights that haven't reached MySQL yet merged in
+        (they replace a stored weight for the same day, as the sync will)
+        """
+        pending = {}
+        for entry in get_write_journal().pending("weight", self.user_id):
+            pending[entry['log_date']] = entry['weight_kg']  # oldest first, so the newest wins
+        if len(series) >= WEIGHT_PAGE_SIZE:
+            # Older history isn't loaded; leave pending days before it for "Load older"
+            oldest = series.dates[0].item()
+            pending = {day: kg for day, kg in pending.items() if day >= oldest}
+        if not pending:
+            return series
+
+        rows = [row for row in series.rows() if row['date'] not in pending]
+        rows += [{'log_id': -i, 'date': day, 'weight_kg': kg} for i, (day, kg) in enumerate(pending.items(), 1)]
+        rows.sort(key=lambda row: row['date'])
+        return WeightSeries.from_rows(rows, series.height_m)
+
+    def load_older_logs(self):
+        if not len(self.series):
+            return
+        older = get_weight_series(self.user_id, before=self.series.dates[0].item(), limit=WEIGHT_PAGE_SIZE,
+                                  newest_first=True)
+        if not len(older):
+            self.older_button.config(state="disabled")
+            return
+        self.show_series(self.series.prepend(older))
+        self.logs_list.scroll_to(len(older) - 1)  # land on the newest of the older rows
+        if len(older) < WEIGHT_PAGE_SIZE:
+            self.older_button.config(state="disabled")
 
     # ------------------ BMI ------------------
-    def get_user_height_m(self):
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT height_cm FROM users WHERE user_id = %s", (self.user_id,))
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        if row:
-            return float(row[0]) / 100
-        return 1.75
-
-    def get_bmi_category(self, bmi):
-        for lower, upper, cat in BMI_CATEGORIES:
-            if lower <= bmi <= upper:
-                return cat
-        return "Unknown"
-
-    def refresh_bmi(self):
-        logs = get_weight_logs_for_user(self.user_id)
-        if not logs:
+    def refresh_bmi(self, series=None):
+        if series is None:
+            # Enough entries for the trend; only the last one is needed for the BMI
+            series = get_weight_series(self.user_id, limit=TREND_WINDOW_DAYS, newest_first=True)
+        latest = series.latest()
+        if latest is None:
             self.bmi_label.config(text="BMI: N/A")
             return
-        latest_log = logs[-1]
-        height_m = self.get_user_height_m()
-        bmi = float(latest_log['weight_kg']) / (height_m ** 2)
-        category = self.get_bmi_category(bmi)
-        self.bmi_label.config(text=f"BMI: {bmi:.1f} ({category})")
+        text = f"BMI: {latest['bmi']:.1f} ({latest['bmi_category']})"
+        slope = series.trend_slope("lb", window_days=TREND_WINDOW_DAYS)
+        if slope is not None:
+            text += f"   Trend: {slope:+.1f} lb/week"
+        self.bmi_label.config(text=text)
 
     # ------------------ Chart ------------------
-    def refresh_chart(self):
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-
-        logs = get_weight_logs_for_user(self.user_id)
-        if not logs:
+    def refresh_chart(self, series=None):
+        if series is None:
+            series = get_weight_series(self.user_id, limit=WEIGHT_PAGE_SIZE, newest_first=True)
+        # Same figure every time; only the line data changes
+        self.weight_chart.set_series(series.dates, series.lb, series.bmi)
+
+    # ------------------ Weight Logs ------------------
+    def refresh_weight_logs(self, series=None):
+        if series is None:
+            series = get_weight_series(self.user_id, limit=WEIGHT_PAGE_SIZE, newest_first=True)
+
+        first_fill = len(self.logs_list) == 0
+        self.logs_list.set_rows(series.rows())
+        if first_fill:
+            self.logs_list.scroll_to_end()  # newest entries are at the bottom
+
+    def render_weight_row(self, log):
+        day = str(log['date']) + (" (not synced)" if log['log_id'] < 0 else "")
+        return day, f"{log['weight_lb']:.1f}", f"{log['bmi']:.1f}"
+
+    @staticmethod
+    def is_pending(log):
+        """Journalled rows have negative ids until the sync writes them to MySQL"""
+        return log['log_id'] < 0
+
+    def edit_weight_log(self, log):
+        if self.is_pending(log):
+            messagebox.showinfo("Not synced yet", "This weight is still being saved; try again in a moment.")
             return
-
-        height_m = self.get_user_height_m()
-        dates = [log['date'] for log in logs]
-        weights_lb = [float(log['weight_kg']) / 0.453592 for log in logs]
-        bmi_values = [float(log['weight_kg']) / (height_m ** 2) for log in logs]
-
-        fig, ax1 = plt.subplots(figsize=(8,3), dpi=100)
-        ax1.plot(dates, weights_lb, color='blue', marker='o', label='Weight (lb)')
-        ax1.set_xlabel("Date")
-        ax1.set_ylabel("Weight (lb)", color='blue')
-        ax1.tick_params(axis='y', labelcolor='blue')
-
-        ax2 = ax1.twinx()
-        ax2.plot(dates, bmi_values, color='red', marker='x', linestyle='--', label='BMI')
-        ax2.set_ylabel("BMI", color='red')
-        ax2.tick_params(axis='y', labelcolor='red')
-
-        lines, labels = ax1.get_legend_handles_labels()
-        lines2, labels2 = ax2.get_legend_handles_labels()
-        ax1.legend(lines + lines2, labels + labels2, loc='upper left')
-
-        ax1.grid(True)
-        fig.tight_layout()
-
-        self.canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
-
-# ------------------ Weight Logs ------------------
-    def refresh_weight_logs(self):
-        # Clear previous log widgets
-        for widget in self.logs_frame.winfo_children():
-            widget.destroy()
-
-        logs = get_weight_logs_for_user(self.user_id)
-        if not logs:
-            tk.Label(self.logs_frame, text="No logs").grid(row=0, column=0)
+        new_lb = simpledialog.askfloat("Edit Weight", f"Weight on {log['date']} (lb):",
+                                       initialvalue=round(log['weight_lb'], 1), minvalue=0.1)
+        if new_lb is None:
             return
+        if not update_weight_log(log['log_id'], round(new_lb * KG_PER_LB, 2)):
+            messagebox.showerror("Not saved", "Could not reach the database; try again later.")
+            return
+        self.logs_changed()
 
-        height_m = self.get_user_height_m()
-
-        # Create header
-        headers = ["Date", "Weight (lb)", "BMI", "Edit", "Delete"]
-        for col, h in enumerate(headers):
-            tk.Label(self.logs_frame, text=h, font=("Helvetica", 10, "bold")).grid(row=0, column=col, padx=5, pady=2)
-
-        # Fill logs
-        for row_idx, log in enumerate(logs, start=1):
-            weight_lb = float(log['weight_kg']) / 0.453592
-            bmi = float(log['weight_kg']) / (height_m ** 2)
-
-            tk.Label(self.logs_frame, text=str(log['date'])).grid(row=row_idx, column=0, padx=5, pady=2)
-            tk.Label(self.logs_frame, text=f"{weight_lb:.1f}").grid(row=row_idx, column=1, padx=5, pady=2)
-            tk.Label(self.logs_frame, text=f"{bmi:.1f}").grid(row=row_idx, column=2, padx=5, pady=2)
-
-            tk.Button(self.logs_frame, text="Edit", width=6, 
-                    command=lambda l=log: self.edit_weight_log(l)).grid(row=row_idx, column=3, padx=5, pady=2)
-            tk.Button(self.logs_frame, text="Delete", width=6, 
-                    command=lambda l=log: self.delete_weight_log(l)).grid(row=row_idx, column=4, padx=5, pady=2)
+    def delete_weight_log(self, log):
+        if self.is_pending(log):
+            messagebox.showinfo("Not synced yet", "This weight is still being saved; try again in a moment.")
+            return
+        if not messagebox.askyesno("Delete weight", f"Delete the weight logged on {log['date']}?"):
+            return
+        if not delete_weight_log(log['log_id']):
+            messagebox.showerror("Not deleted", "Could not reach the database; try again later.")
+            return
+        self.logs_changed()
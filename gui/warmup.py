@@ -0,0 +1,51 @@
+# gui/warmup.py
+"""
+Background import of the modules the dashboard needs.
+
+The login window is built from tkinter alone; everything heavy (matplotlib,
+tkcalendar, mysql.connector, requests, bcrypt) is imported here on a daemon
+thread while the user types credentials, so the dashboard opens without the
+import pause. Nothing in this thread touches Tk.
+"""
+import importlib
+import threading
+import time
+
+WARMUP_MODULES = (
+    "backend.auth.auth",         # bcrypt + mysql.connector
+    "gui.screens.dashboard",     # matplotlib, FigureCanvasTkAgg, tkcalendar, requests, numpy
+)
+
+_done = threading.Event()
+_thread = None
+_lock = threading.Lock()
+timings = {}  # module -> seconds to import (for the startup benchmark)
+
+
+def start_warmup(modules=WARMUP_MODULES):
+    """Start importing modules on a daemon thread (only once)"""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=_run, args=(modules,), name="warmup", daemon=True)
+        _thread.start()
+
+
+def wait_for_warmup(timeout=None):
+    """True once every warm-up import has finished"""
+    return _done.wait(timeout)
+
+
+def _run(modules):
+    try:
+        for name in modules:
+            started = time.perf_counter()
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                # The real import on first use will raise it again where it can be shown
+                print(f"Warm-up import of {name} failed: {e}")
+            timings[name] = time.perf_counter() - started
+    finally:
+        _done.set()
@@ -2,13 +2,40 @@
 import tkinter as tk
 from tkcalendar import Calendar
 from datetime import date
+from backend.services.calendar_service import (
+    get_cached_month_overview,
+    get_month_overview_async,
+    prefetch_adjacent_months
+)
+from backend.services.goal_service import FALLBACK_TARGET
+
+# Day colours by calories eaten / daily target: (upper ratio, tag, background)
+CALORIE_BANDS = [
+    (0.9, "under", "#c8e6c9"),
+    (1.1, "near", "#fff59d"),
+    (None, "over", "#ffcdd2"),
+]
+WEIGHED_FOREGROUND = "#0d47a1"  # text colour of days with a weigh-in
+WEIGHED_ONLY_BACKGROUND = "#e3f2fd"
+
 
 class CalendarPanel(tk.Frame):
-    def __init__(self, parent, on_date_selected=None):
+    """
+    Month calendar coloured by calories vs. target, with weigh-in days in blue.
+
+    Each displayed month comes from one cached range query
+    (calendar_service); the previous and next month are prefetched.
+    """
+    POLL_MS = 50
+
+    def __init__(self, parent, on_date_selected=None, user_id=None, get_target=None):
         super().__init__(parent)
         self.parent = parent
         self.on_date_selected = on_date_selected
+        self.user_id = user_id
+        self.get_target = get_target or (lambda: FALLBACK_TARGET)
         self.selected_date = date.today()
+        self.pending_month = None  # (year, month) being loaded
 
         self.calendar = Calendar(
             self,
@@ -20,6 +47,19 @@ class CalendarPanel(tk.Frame):
         )
         self.calendar.pack(padx=10, pady=5)
         self.calendar.bind("<<CalendarSelected>>", self.date_selected)
+        self.calendar.bind("<<CalendarMonthChanged>>", self.month_changed)
+
+        for _, tag, background in CALORIE_BANDS:
+            self.calendar.tag_config(tag, background=background, foreground="black")
+            self.calendar.tag_config(f"{tag}_weighed", background=background, foreground=WEIGHED_FOREGROUND)
+        self.calendar.tag_config("weighed", background=WEIGHED_ONLY_BACKGROUND, foreground=WEIGHED_FOREGROUND)
+
+        legend = tk.Frame(self)
+        legend.pack(padx=10, anchor="w")
+        for text, background in (("Under", CALORIE_BANDS[0][2]), ("Near", CALORIE_BANDS[1][2]),
+                                 ("Over target", CALORIE_BANDS[2][2])):
+            tk.Label(legend, text=text, background=background, padx=4).pack(side="left", padx=2)
+        tk.Label(legend, text="Weighed", foreground=WEIGHED_FOREGROUND, padx=4).pack(side="left", padx=2)
 
     def date_selected(self, event=None):
         self.selected_date = self.calendar.get_date()
@@ -29,3 +69,53 @@ class CalendarPanel(tk.Frame):
             self.selected_date = date(y, m, d)
         if self.on_date_selected:
             self.on_date_selected(self.selected_date)
+
+    # ----------------- Heatmap -----------------
+    def displayed_month(self):
+        month, year = self.calendar.get_displayed_month()
+        return year, month
+
+    def month_changed(self, event=None):
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the displayed month (re-queries only if its cache was invalidated)"""
+        if self.user_id is None:
+            return
+        year, month = self.displayed_month()
+        overview = get_cached_month_overview(self.user_id, year, month)
+        if overview is not None:
+            self.render_month(overview)
+        else:
+            self.pending_month = (year, month)
+            future = get_month_overview_async(self.user_id, year, month)
+            self.after(self.POLL_MS, self.poll_month, (year, month), future)
+        prefetch_adjacent_months(self.user_id, year, month)
+
+    def poll_month(self, month_key, future):
+        if not future.done():
+            self.after(self.POLL_MS, self.poll_month, month_key, future)
+            return
+        if month_key != self.pending_month or month_key != self.displayed_month():
+            return  # the user has moved on to another month
+        self.pending_month = None
+        try:
+            overview = future.result()
+        except Exception as e:
+            print(f"Calendar month load failed: {e}")
+            return
+        self.render_month(overview)
+
+    def render_month(self, overview):
+        target = self.get_target() or FALLBACK_TARGET
+        self.calendar.calevent_remove("all")
+        for day, entry in overview.items():
+            calories = entry["calories"]
+            if calories is None:
+                tag, text = "weighed", "Weighed in"
+            else:
+                tag = next(t for limit, t, _ in CALORIE_BANDS if limit is None or calories <= target * limit)
+                text = f"{calories:,.0f} / {target:,} kcal"
+                if entry["weighed"]:
+                    tag, text = f"{tag}_weighed", text + ", weighed in"
+            self.calendar.calevent_create(day, text, tags=[tag])
@@ -1,28 +1,14 @@
 import tkinter as tk
 from tkinter import ttk
-from backend.db.connection import create_connection
-
-# Activity multipliers based on Harris-Benedict Equation
-ACTIVITY_LEVELS = {
-    "Sedentary (little/no exercise)": 1.2,
-    "Lightly Active (light exercise 1-3 days/week)": 1.375,
-    "Moderately Active (moderate exercise 3-5 days/week)": 1.55,
-    "Very Active (hard exercise 6-7 days/week)": 1.725,
-    "Extra Active (very hard exercise & physical job)": 1.9
-}
-
-# Weight loss goals in lbs/week
-WEIGHT_LOSS_GOALS = {
-    "Maintain Weight": 0,
-    "1 lb/week": 1,
-    "2 lbs/week": 2
-}
+from backend.services.goal_service import ACTIVITY_LEVELS, WEIGHT_LOSS_GOALS, calculate_daily_target
+from backend.services.snapshot_service import get_user_profile
 
 class CalorieGoalPanel(tk.Frame):
     def __init__(self, parent, user):
         super().__init__(parent, bd=1, relief="groove", padx=10, pady=10)
         self.user = user
         self.user_id = user["user_id"]
+        self.profile = user  # refreshed from dashboard snapshots
 
         # Variables
         self.activity_var = tk.StringVar(value=list(ACTIVITY_LEVELS.keys())[0])
@@ -52,43 +38,23 @@ class CalorieGoalPanel(tk.Frame):
     # ------------------- Calculate daily target -------------------
     def calculate_target(self, *_):
         """Compute BMR and adjust for activity + weight loss goal"""
-        # Get user height, weight, age, gender
-        conn = create_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT weight_kg, height_cm, age, gender FROM users WHERE user_id=%s", (self.user_id,))
-        user_row = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        if not user_row:
-            self.daily_target = 2000  # fallback
-            self.target_label.config(text=f"Target: {self.daily_target} kcal")
-            return
-
-        weight_kg = float(user_row['weight_kg'])
-        height_cm = float(user_row['height_cm'])
-        age = int(user_row['age'])
-        gender = user_row['gender']
+        # Only query if we were handed a partial user dict
+        if "height_cm" not in self.profile:
+            self.profile = get_user_profile(self.user_id) or {}
 
-        # Harris-Benedict BMR
-        if gender.lower() == "male":
-            bmr = 88.36 + (13.4 * weight_kg) + (4.8 * height_cm) - (5.7 * age)
-        else:
-            bmr = 447.6 + (9.2 * weight_kg) + (3.1 * height_cm) - (4.3 * age)
-
-        # Activity multiplier
-        activity_multiplier = ACTIVITY_LEVELS.get(self.activity_var.get(), 1.2)
-        maintenance_calories = bmr * activity_multiplier
-
-        # Adjust for weight loss goal
-        lbs_per_week = WEIGHT_LOSS_GOALS.get(self.goal_var.get(), 0)
-        # 1 lb fat ≈ 3500 kcal
-        daily_deficit = (lbs_per_week * 3500) / 7
-        self.daily_target = max(0, int(maintenance_calories - daily_deficit))
+        self.daily_target = calculate_daily_target(self.profile, self.activity_var.get(), self.goal_var.get())
 
         # Update label
         self.target_label.config(text=f"Target: {self.daily_target} kcal")
 
+    # ------------------- Snapshot -------------------
+    def apply_snapshot(self, snapshot):
+        """Render from a dashboard snapshot instead of re-querying the user"""
+        if snapshot["user"]:
+            self.profile = snapshot["user"]
+        self.daily_target = snapshot["target"]
+        self.target_label.config(text=f"Target: {self.daily_target} kcal")
+
     # ------------------- Getter -------------------
     def get_daily_target(self):
         return self.daily_target
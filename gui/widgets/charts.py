@@ -0,0 +1,133 @@
+# gui/widgets/charts.py
+import tkinter as tk
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from charts.weight.lod import as_day_numbers, level_of_detail
+
+
+class ChartPanel(tk.Frame):
+    """
+    Tk frame owning one matplotlib Figure + canvas for its whole life.
+
+    Subclasses build their artists once in build() (the default is one empty
+    axes) and later only change their data, then call redraw(). Figures are created with
+    matplotlib.figure.Figure (not pyplot), so nothing keeps them alive once
+    the panel is destroyed.
+    """
+
+    def __init__(self, parent, figsize=(6, 3), dpi=100):
+        super().__init__(parent)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.build(self.figure)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self)
+        self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
+        self.canvas.draw()
+
+    def build(self, figure):
+        self.ax = figure.add_subplot(111)
+
+    def redraw(self):
+        # Coalesces with other pending draws; Tk paints on the next idle
+        self.canvas.draw_idle()
+
+    def destroy(self):
+        self.figure.clear()
+        super().destroy()
+
+
+class CalorieBarChart(ChartPanel):
+    """Single bar of calories eaten against a dashed target line"""
+
+    def build(self, figure):
+        self.ax = figure.add_subplot(111)
+        self.bar = self.ax.bar(['Calories'], [0], color='green')[0]
+        self.target_line = self.ax.axhline(0, color='blue', linestyle='--', label='Planned Target')
+        self.ax.set_ylabel("Calories")
+        self.ax.legend()
+        self.ax.grid(True)
+
+    def set_values(self, total_calories, target):
+        self.bar.set_height(total_calories)
+        self.bar.set_color('green' if total_calories <= target else 'red')
+        self.target_line.set_ydata([target, target])
+        self.ax.set_ylim(0, max(total_calories, target, 1) * 1.2)
+        self.redraw()
+
+
+class WeightChart(ChartPanel):
+    """
+    Weight (lb) and BMI over time on twin y axes.
+
+    Keeps the full series and draws a level-of-detail reduction of whatever
+    date window is visible, so years of daily weigh-ins cost the same to draw
+    as a few weeks.
+    """
+
+    MARKER_MAX_POINTS = 60  # markers only when points are sparse
+    LOD_METHOD = "lttb"
+
+    def build(self, figure):
+        self.x = np.empty(0)
+        self.weights_lb = np.empty(0)
+        self.bmi_values = np.empty(0)
+        self._applying_lod = False
+
+        self.ax_weight = figure.add_subplot(111)
+        self.ax_weight.xaxis.axis_date()
+        self.weight_line, = self.ax_weight.plot([], [], color='blue', marker='o', label='Weight (lb)')
+        self.ax_weight.set_xlabel("Date")
+        self.ax_weight.set_ylabel("Weight (lb)", color='blue')
+        self.ax_weight.tick_params(axis='y', labelcolor='blue')
+
+        self.ax_bmi = self.ax_weight.twinx()
+        self.bmi_line, = self.ax_bmi.plot([], [], color='red', marker='x', linestyle='--', label='BMI')
+        self.ax_bmi.set_ylabel("BMI", color='red')
+        self.ax_bmi.tick_params(axis='y', labelcolor='red')
+
+        lines = [self.weight_line, self.bmi_line]
+        self.ax_weight.legend(lines, [line.get_label() for line in lines], loc='upper left')
+        self.ax_weight.grid(True)
+        figure.tight_layout()
+
+        # Re-pick the detail level whenever the visible date range changes
+        self.ax_weight.callbacks.connect('xlim_changed', lambda ax: self.apply_lod())
+
+    def set_series(self, dates, weights_lb, bmi_values):
+        self.x = as_day_numbers(dates)  # == matplotlib date numbers
+        self.weights_lb = np.asarray(weights_lb, dtype=float)
+        self.bmi_values = np.asarray(bmi_values, dtype=float)
+
+        if len(self.x):
+            pad = max((self.x[-1] - self.x[0]) * 0.02, 0.5)
+            self.ax_weight.set_xlim(self.x[0] - pad, self.x[-1] + pad)  # triggers apply_lod
+        else:
+            self.apply_lod()
+        for ax in (self.ax_weight, self.ax_bmi):
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+        self.redraw()
+
+    def apply_lod(self):
+        if self._applying_lod:
+            return
+        self._applying_lod = True
+        try:
+            x, (weights, bmis), reduced = level_of_detail(
+                self.x,
+                [self.weights_lb, self.bmi_values],
+                pixel_width=self.ax_weight.bbox.width,
+                window=self.ax_weight.get_xlim(),
+                method=self.LOD_METHOD
+            )
+            self.weight_line.set_data(x, weights)
+            self.bmi_line.set_data(x, bmis)
+            sparse = not reduced and len(x) <= self.MARKER_MAX_POINTS
+            self.weight_line.set_marker('o' if sparse else 'None')
+            self.bmi_line.set_marker('x' if sparse else 'None')
+        finally:
+            self._applying_lod = False
+        self.redraw()
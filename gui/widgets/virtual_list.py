@@ -0,0 +1,223 @@
+# gui/widgets/virtual_list.py
+import tkinter as tk
+
+
+class VirtualList(tk.Frame):
+    """
+    Scrollable table that only materializes the visible rows.
+
+    A fixed pool of `height` row widgets is created once; scrolling or
+    changing the data just re-points the pooled widgets at different rows, so
+    the number of Tk widgets never depends on how many rows there are.
+
+    set_rows() diffs the new rows against the current ones by key and only
+    reconfigures pooled rows whose text actually changed; insert_row(),
+    update_row() and delete_row() apply single edits.
+
+        VirtualList(parent,
+                    columns=[("Date", 12), ("Weight (lb)", 10)],
+                    render=lambda row: (str(row["date"]), f"{row['lb']:.1f}"),
+                    key=lambda row: row["log_id"],
+                    actions=[("Edit", on_edit), ("Delete", on_delete)])
+
+    Rows for which is_header(row) is true are drawn as a bold caption with no
+    action buttons (render should return a 1-tuple for them).
+    """
+
+    def __init__(self, parent, columns, render, key, actions=(), height=8,
+                 is_header=None, empty_text="No rows", show_headings=True):
+        super().__init__(parent)
+        self.columns = columns
+        self.render = render
+        self.key = key
+        self.actions = actions
+        self.height = height
+        self.is_header = is_header or (lambda row: False)
+        self.empty_text = empty_text
+
+        self._rows = []
+        self._positions = {}  # key -> index in self._rows
+        self._rendered = {}   # key -> cells tuple last rendered for it
+        self._first = 0       # index of the top visible row
+        self._slots = []      # pooled row widgets
+        self._slot_state = [None] * height  # (key, cells) each slot shows
+        self._slot_rows = [None] * height   # row object each slot's buttons act on
+
+        self.columnconfigure(0, weight=1)
+
+        body = tk.Frame(self)
+        body.grid(row=1, column=0, sticky="nsew")
+        body.columnconfigure(0, weight=1)
+
+        if show_headings:
+            headings = tk.Frame(self)
+            headings.grid(row=0, column=0, sticky="ew")
+            for col, (title, width) in enumerate(columns):
+                tk.Label(headings, text=title, width=width, anchor="w", font=("Helvetica", 10, "bold"))\
+                    .grid(row=0, column=col, padx=5, pady=2)
+            for offset, (label, _) in enumerate(actions):
+                tk.Label(headings, text=label, width=6, font=("Helvetica", 10, "bold"))\
+                    .grid(row=0, column=len(columns) + offset, padx=5, pady=2)
+
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.empty_label = tk.Label(body, text=empty_text)
+
+        for i in range(height):
+            self._slots.append(self._make_slot(body, i))
+
+        self._bind_wheel(self)
+        self._bind_wheel(body)
+
+    # ----------------- Data -----------------
+    def set_rows(self, rows):
+        """
+        Replace the data, rendering only what changed.
+        Returns (inserted, updated, deleted) counts.
+        """
+        rows = list(rows)
+        new_positions = {self.key(row): i for i, row in enumerate(rows)}
+        old_keys = self._positions.keys()
+
+        inserted = sum(1 for k in new_positions if k not in old_keys)
+        deleted = [k for k in old_keys if k not in new_positions]
+        updated = sum(
+            1 for k, i in new_positions.items()
+            if k in self._rendered and self._rendered[k] != tuple(self.render(rows[i]))
+        )
+
+        for k in deleted:
+            self._rendered.pop(k, None)
+        self._rows = rows
+        self._positions = new_positions
+        self._clamp_first()
+        self._refresh()
+        return inserted, updated, len(deleted)
+
+    def insert_row(self, index, row):
+        self._rows.insert(index, row)
+        self._reindex(index)
+        self._refresh()
+
+    def update_row(self, row):
+        index = self._positions.get(self.key(row))
+        if index is None:
+            return
+        self._rows[index] = row
+        self._refresh()
+
+    def delete_row(self, key):
+        index = self._positions.pop(key, None)
+        if index is None:
+            return
+        del self._rows[index]
+        self._rendered.pop(key, None)
+        self._reindex(index)
+        self._clamp_first()
+        self._refresh()
+
+    def __len__(self):
+        return len(self._rows)
+
+    # ----------------- Scrolling -----------------
+    def scroll_to(self, index):
+        """Make row `index` the top visible row (clamped)"""
+        self._first = index
+        self._clamp_first()
+        self._refresh()
+
+    def scroll_to_end(self):
+        self.scroll_to(len(self._rows))
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(round(float(amount) * len(self._rows)))
+        elif action == "scroll":
+            step = self.height if unit == "pages" else 1
+            self.scroll_to(self._first + int(amount) * step)
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self._first - 3)
+        else:
+            self.scroll_to(self._first + 3)
+        return "break"
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+
+    # ----------------- Rendering -----------------
+    def _make_slot(self, body, index):
+        frame = tk.Frame(body)
+        cells = []
+        for col, (_, width) in enumerate(self.columns):
+            label = tk.Label(frame, width=width, anchor="w")
+            self._body_font = label.cget("font")
+            label.grid(row=0, column=col, padx=5, pady=2, sticky="w")
+            self._bind_wheel(label)
+            cells.append(label)
+        buttons = []
+        for offset, (text, _) in enumerate(self.actions):
+            button = tk.Button(frame, text=text, width=6)
+            button.grid(row=0, column=len(self.columns) + offset, padx=5, pady=2)
+            self._bind_wheel(button)
+            buttons.append(button)
+        self._bind_wheel(frame)
+        return frame, cells, buttons
+
+    def _refresh(self):
+        """Point the pooled widgets at rows [first, first + height)"""
+        if not self._rows:
+            self.empty_label.grid(row=0, column=0, sticky="w")
+        else:
+            self.empty_label.grid_remove()
+
+        for slot_index, (frame, cells, buttons) in enumerate(self._slots):
+            row_index = self._first + slot_index
+            if row_index >= len(self._rows):
+                if self._slot_state[slot_index] is not None:
+                    frame.grid_remove()
+                    self._slot_state[slot_index] = None
+                    self._slot_rows[slot_index] = None
+                continue
+
+            row = self._rows[row_index]
+            key = self.key(row)
+            texts = tuple(self.render(row))
+            self._rendered[key] = texts
+            if self._slot_state[slot_index] != (key, texts):
+                self._draw_slot(cells, buttons, row, texts)
+                self._slot_state[slot_index] = (key, texts)
+            # Commands close over the row object, which may be newer than its text
+            if self._slot_rows[slot_index] is not row:
+                for button, (_, callback) in zip(buttons, self.actions):
+                    button.config(command=lambda r=row, cb=callback: cb(r))
+                self._slot_rows[slot_index] = row
+                frame.grid(row=slot_index + 1, column=0, sticky="ew")
+
+        total = len(self._rows)
+        if total <= self.height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self._first / total, (self._first + self.height) / total)
+
+    def _draw_slot(self, cells, buttons, row, texts):
+        header = self.is_header(row)
+        for col, label in enumerate(cells):
+            text = texts[col] if col < len(texts) else ""
+            label.config(text=text, font=("Helvetica", 12, "bold") if header else self._body_font)
+        for button in buttons:
+            if header:
+                button.grid_remove()
+            else:
+                button.grid()
+
+    def _reindex(self, start):
+        for i in range(start, len(self._rows)):
+            self._positions[self.key(self._rows[i])] = i
+
+    def _clamp_first(self):
+        self._first = max(0, min(self._first, len(self._rows) - self.height))
@@ -1,5 +1,8 @@
 import tkinter as tk
 from gui.screens.login_screen import LoginScreen
+from gui.warmup import start_warmup
+
+WARMUP_DELAY_MS = 100  # let the login window paint before importing the rest
 
 user_id = 1
 
@@ -8,5 +11,6 @@ root.title("User Login")
 root.geometry("400x400")
 
 screen = LoginScreen(root, on_login_success=lambda user: print(f"Logged in user: {user}"))
+root.after(WARMUP_DELAY_MS, start_warmup)
 
 root.mainloop()